@@ -1,9 +1,35 @@
 import streamlit as st
 import pandas as pd
-import re
-from io import BytesIO, StringIO
+import time
+import logging
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
 import dropbox
-from dropbox.exceptions import AuthError
+
+from pretraga import (
+    create_csv_download,
+    create_excel_download,
+    hash_rezultata,
+    memorija_kataloga,
+    pretrazi_barkod,
+    pretrazi_pojmove,
+    sredi_rezultate,
+)
+from pretraga.cache import procitaj_manifest, spremi_manifest
+from pretraga.config import IZVOR_CJENIKA, PODACI_DIR
+from pretraga.cache_rezultata import (
+    dohvati_rezultat,
+    kljuc_upita,
+    spremi_rezultat,
+    statistika_cachea,
+)
+from pretraga.izvori import napravi_izvor
+from pretraga.lokalno import ucitaj_pretragu_iz_izvora
+from pretraga.mjerenje import faza, tablica_faza, zapocni_mjerenje, zavrsi_mjerenje
+from pretraga.normalizacija import normaliziraj_upit
+from pretraga.query import OZNAKA_PRIBLIZNO
+from pretraga.zagrijavanje import aktivna_pretraga, dohvati_ili_izgradi, pokreni_zagrijavanje, stanje_zagrijavanja
 
 # ──────────────────────────────────────────────────────────────────────
 # KONFIGURACIJA
@@ -146,261 +172,226 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ──────────────────────────────────────────────────────────────────────
-# KONFIGURACIJA DUĆANA
+# KONFIGURACIJA UČITAVANJA (dućani su u pretraga/config.py)
 # ──────────────────────────────────────────────────────────────────────
 
-DUCANI_CONFIG = {
-    "Plodine": {
-        "filename": "plodine_jucer.csv",
-        "separator": ";",
-        "encoding": "windows-1250",
-        "columns": {
-            "naziv": "Naziv proizvoda",
-            "sifra": "Sifra proizvoda",
-            "barkod": "Barkod",
-            "kategorija": "Kategorija proizvoda",
-            "maloprodajna": "Maloprodajna cijena",
-            "akcijska": "MPC za vrijeme posebnog oblika prodaje",
-            "jedinica": "Jedinica mjere"
-        },
-        "price_logic": "fillna"
-    },
-    "Eurospin": {
-        "filename": "eurospin_jucer.csv",
-        "separator": ";",
-        "encoding": "windows-1250",
-        "columns": {
-            "naziv": "NAZIV_PROIZVODA",
-            "sifra": "ŠIFRA_PROIZVODA",
-            "barkod": "BARKOD",
-            "kategorija": "KATEGORIJA_PROIZVODA",
-            "maloprodajna": "MALOPROD.CIJENA(EUR)",
-            "akcijska": "MPC_POSEB.OBLIK_PROD",
-            "jedinica": "JEDINICA_MJERE"
-        },
-        "price_logic": "eurospin"
-    },
-    "Kaufland": {
-        "filename": "kaufland_jucer.csv",
-        "separator": "\t",
-        "encoding": "utf-8",
-        "columns": {
-            "naziv": "naziv proizvoda",
-            "sifra": "šifra proizvoda",
-            "barkod": "barkod",
-            "kategorija": "kategorija proizvoda",
-            "maloprodajna": None,
-            "akcijska": None,
-            "jedinica": "jedinica mjere"
-        },
-        "price_logic": "fillna"
-    },
-    "Konzum": {
-        "filename": "konzum_jucer.csv",
-        "separator": ",",
-        "encoding": "utf-8",
-        "columns": {
-            "naziv": "NAZIV PROIZVODA",
-            "sifra": "ŠIFRA PROIZVODA",
-            "barkod": "BARKOD",
-            "kategorija": "KATEGORIJA PROIZVODA",
-            "maloprodajna": "MALOPRODAJNA CIJENA",
-            "akcijska": "MPC ZA VRIJEME POSEBNOG OBLIKA PRODAJE",
-            "jedinica": "JEDINICA MJERE"
-        },
-        "price_logic": "fillna"
-    },
-    "Lidl": {
-        "filename": "lidl_jucer.csv",
-        "separator": ",",
-        "encoding": "windows-1250",
-        "columns": {
-            "naziv": "NAZIV",
-            "sifra": "ŠIFRA",
-            "barkod": "BARKOD",
-            "kategorija": "KATEGORIJA_PROIZVODA",
-            "maloprodajna": "MALOPRODAJNA_CIJENA",
-            "akcijska": "MPC_ZA_VRIJEME_POSEBNOG_OBLIKA_PRODAJE",
-            "jedinica": "JEDINICA_MJERE"
-        },
-        "price_logic": "fillna"
-    },
-    "Spar": {
-        "filename": "spar_jucer.csv",
-        "separator": ";",
-        "encoding": "windows-1250",
-        "columns": {
-            "naziv": "naziv",
-            "sifra": "šifra",
-            "barkod": "barkod",
-            "kategorija": "kategorija proizvoda",
-            "maloprodajna": "MPC (EUR)",
-            "akcijska": "MPC za vrijeme posebnog oblika prodaje (EUR)",
-            "jedinica": "jedinica mjere"
-        },
-        "price_logic": "spar"
-    }
+# Paralelne veze prema Dropboxu (dućani se učitavaju paralelno)
+MAX_DRETVI = 6
+
+# Koliko često (sekundi) se u izvoru (Dropbox) provjerava je li se datoteka promijenila
+PROVJERA_VERZIJE = 60
+ZAGREB = ZoneInfo("Europe/Zagreb")
+
+# Preuzimanje rezultata: format → (opis, ime datoteke, MIME tip)
+IZVOZ = {
+    "xlsx": ("Excel", "rezultati_cijene.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "rezultati_cijene.csv", "text/csv")
 }
 
+# Dropbox klijent (mogu se nadjačati u st.secrets)
+DROPBOX_TIMEOUT = 30  # sekundi po HTTP zahtjevu
+DROPBOX_POKUSAJI = 3  # ponavljanja kod mrežnih grešaka i rate limita
+
+logger = logging.getLogger(__name__)
+
+# Faze svake pretrage uvijek idu u log (strukturirani reci ključ=vrijednost)
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.getLogger("pretraga.mjerenje").setLevel(logging.INFO)
+
 # ──────────────────────────────────────────────────────────────────────
 # HELPER FUNKCIJE
 # ──────────────────────────────────────────────────────────────────────
 
-def wildcard_to_regex(pattern):
-    """Pretvara wildcard pattern (* i ?) u regex"""
-    pattern = re.escape(pattern.lower())
-    pattern = pattern.replace(r'\*', '.*').replace(r'\?', '.')
-    return '^' + pattern
+def novi_dropbox_klijent():
+    """Dropbox klijent iz st.secrets, s poolom HTTPS veza za paralelne dretve"""
+    return dropbox.Dropbox(
+        app_key=st.secrets["DROPBOX_APP_KEY"],
+        app_secret=st.secrets["DROPBOX_APP_SECRET"],
+        oauth2_refresh_token=st.secrets["DROPBOX_REFRESH_TOKEN"],
+        session=dropbox.create_session(max_connections=MAX_DRETVI),
+        timeout=float(st.secrets.get("DROPBOX_TIMEOUT", DROPBOX_TIMEOUT)),
+        max_retries_on_error=int(st.secrets.get("DROPBOX_POKUSAJI", DROPBOX_POKUSAJI)),
+        max_retries_on_rate_limit=int(st.secrets.get("DROPBOX_POKUSAJI", DROPBOX_POKUSAJI))
+    )
+
+@st.cache_resource(show_spinner=False)
+def izvor_cjenika():
+    """Izvor cjenika za cijeli proces (PRETRAGA_IZVOR): Dropbox, lokalni direktorij ili lažni Dropbox.
+    
+    Izvor (i jedan Dropbox klijent u njemu) dijele zahtjevi i dretva zagrijavanja, koja
+    ga koristi izvan konteksta skripte - zato klijent ne ide kroz Streamlit cache.
+    """
+    klijent, lock = {}, threading.Lock()
+    
+    def dropbox_klijent():
+        # Token se osvježava samo kad istječe; zaključano da ga paralelne dretve ne osvježavaju istovremeno
+        with lock:
+            if "klijent" not in klijent:
+                klijent["klijent"] = novi_dropbox_klijent()
+            klijent["klijent"].check_and_refresh_access_token()
+            return klijent["klijent"]
+    
+    return izvor_s_manifestom(napravi_izvor(IZVOR_CJENIKA, PODACI_DIR, dropbox_klijent))
 
-def convert_price(val):
-    """Konvertira string cijene u float"""
-    if pd.isna(val) or val == '':
-        return None
-    try:
-        cleaned = str(val).replace(',', '.').replace(' ', '').strip()
-        if cleaned == '':
-            return None
-        return float(cleaned)
-    except:
-        return None
+def izvor_s_manifestom(izvor):
+    """Izvor čiji metapodaci prolaze kroz manifest na disku, s opisnim greškama.
+    
+    Ako je provjera na disku mlađa od PROVJERA_VERZIJE, izvor se ne kontaktira; ako izvor
+    nije dostupan, koristi se zadnja verzija zapisana na disku.
+    """
+    def metapodaci(filename):
+        manifest = procitaj_manifest(filename)
+        if manifest and time.time() - manifest["provjereno"] < PROVJERA_VERZIJE:
+            return manifest
+        
+        try:
+            meta = izvor["metapodaci"](filename)
+            meta = {**meta, "izmijenjeno": meta["izmijenjeno"].astimezone(ZAGREB), "provjereno": time.time()}
+        except Exception as e:
+            if manifest:
+                logger.warning("%s nedostupan za %s, koristim verziju s diska: %s", izvor["naziv"], filename, e)
+                return manifest
+            if isinstance(e, RuntimeError):
+                raise
+            raise RuntimeError(f"Greška pri provjeri {filename} ({izvor['naziv']}): {e}") from e
+        
+        try:
+            spremi_manifest(filename, meta)
+        except OSError as e:
+            logger.warning("Ne mogu zapisati manifest za %s: %s", filename, e)
+        return meta
+    
+    def preuzmi(filename, rev=None):
+        try:
+            return izvor["preuzmi"](filename, rev)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Greška pri učitavanju {filename} ({izvor['naziv']}): {e}") from e
+    
+    return {**izvor, "metapodaci": metapodaci, "preuzmi": preuzmi}
 
-@st.cache_data(ttl=3600)
-def load_csv_from_dropbox(filename):
-    """Učitava CSV datoteku s Dropboxa"""
+def osvjezi_pretragu(izvor):
+    """Pretraga za trenutne revizije izravno iz izvora (posao zagrijavanja i zahtjeva prije prve objave).
+    
+    Ne prolazi kroz Streamlit cacheve, pa radi i u dretvi zagrijavanja bez konteksta
+    skripte; potpuna aktivna pretraga istih verzija vraća se bez ponovne izgradnje.
+    """
+    pretraga = ucitaj_pretragu_iz_izvora(izvor, trenutna=aktivna_pretraga())
+    for ime, greska in pretraga["greske"].items():
+        logger.warning("%s nije učitan: %s", ime, greska)
+    return pretraga
+
+def dohvati_pretragu():
+    """Vraća (aktivna pretraga ili None, {dućan: greška}).
+    
+    Aktivnu pretragu gradi i zamjenjuje pozadinsko zagrijavanje; zahtjev koji stigne prije
+    prve objave čeka tu izgradnju (a gradi sam samo ako ni nakon nje nema pretrage).
+    Nepotpuna pretraga vraća se s greškama; zagrijavanje dućane koji nedostaju ponovno
+    pokušava za PROVJERA_NAKON_GRESKE, a ne tek na sljedećoj redovnoj provjeri.
+    """
+    izvor = izvor_cjenika()
     try:
-        dbx = dropbox.Dropbox(
-            app_key=st.secrets["DROPBOX_APP_KEY"],
-            app_secret=st.secrets["DROPBOX_APP_SECRET"],
-            oauth2_refresh_token=st.secrets["DROPBOX_REFRESH_TOKEN"]
-        )
-        _, response = dbx.files_download(f"/{filename}")
-        return response.content
-    except AuthError as e:
-        st.error(f"Dropbox autentikacija nije uspjela: {e}")
-        return None
+        with st.spinner("📥 Učitavam cjenike..."):
+            pretraga = dohvati_ili_izgradi(lambda: osvjezi_pretragu(izvor))
     except Exception as e:
-        st.error(f"Greška pri učitavanju {filename} s Dropboxa: {e}")
-        return None
+        return None, {"Cjenici": e}
+    return pretraga, pretraga["greske"]
 
-def determine_final_price(row, config, debug_mode=False):
-    """Određuje finalnu cijenu proizvoda"""
-    maloprodajna_col = config["columns"]["maloprodajna"]
-    akcijska_col = config["columns"]["akcijska"]
-    
-    maloprodajna = row.get(maloprodajna_col)
-    akcijska = row.get(akcijska_col) if akcijska_col else None
-    
-    if pd.notna(akcijska) and akcijska > 0:
-        return akcijska
-    return maloprodajna
+def rezultati_pretrage(pretraga, pojmovi, barkod, priblizno=False):
+    """Sređena tablica rezultata (None ako nema pogodaka) iz zajedničkog cachea ili nove pretrage"""
+    nacin, upit = ("barkod", barkod) if barkod else ("pojmovi~" if priblizno else "pojmovi", pojmovi)
+    kljuc = kljuc_upita(nacin, upit, pretraga["verzija"])
+    with faza("cache_rezultata") as f:
+        pogodak, df = dohvati_rezultat(kljuc)
+        f["pogodak"] = int(pogodak)
+    
+    if not pogodak:
+        if barkod:
+            svi_rez = pretrazi_barkod(barkod, pretraga["katalog"], pretraga["barkodovi"])
+        else:
+            svi_rez = pretrazi_pojmove(pretraga["katalog"], pretraga["indeks"], pojmovi, pretraga["rjecnik"], priblizno)
+        df = sredi_rezultate(svi_rez) if svi_rez else None
+        if not pretraga["greske"]:
+            # Rezultati nepotpunog kataloga se ne dijele - dućani koji nedostaju uskoro se vraćaju
+            spremi_rezultat(kljuc, df)
+    elif df is not None and pojmovi:
+        # Tablica iz cachea nosi pojmove kako ih je upisao prvi korisnik ("pojam" ili "pojam ≈ varijanta")
+        originali = {normaliziraj_upit(p): p for p in pojmovi}
+        def oznaka(t):
+            pojam, znak, varijanta = t.partition(OZNAKA_PRIBLIZNO)
+            return originali.get(normaliziraj_upit(pojam), pojam) + znak + varijanta
+        df = df.assign(**{"Traženi pojam": df["Traženi pojam"].map(oznaka)})
+    return df
 
-def pretrazi_ducan(ducan_naziv, config, pojmovi=None, barkod=None, debug_mode=False):
-    """Pretražuje jedan dućan"""
-    rezultati = []
-    
-    try:
-        content = load_csv_from_dropbox(config["filename"])
-        if content is None:
-            return rezultati
-        
-        df = pd.read_csv(
-            StringIO(content.decode(config["encoding"])),
-            sep=config["separator"],
-            on_bad_lines='skip'
-        )
-        
-        df.columns = df.columns.str.strip()
-        
-        if config["columns"]["maloprodajna"] is None:
-            cijene = [c for c in df.columns if "maloprod" in c.lower()]
-            if cijene:
-                config["columns"]["maloprodajna"] = cijene[0]
-            else:
-                return rezultati
-        
-        df[config["columns"]["maloprodajna"]] = df[config["columns"]["maloprodajna"]].apply(convert_price)
-        
-        if config["columns"]["akcijska"]:
-            df[config["columns"]["akcijska"]] = df[config["columns"]["akcijska"]].apply(convert_price)
-        
-        df["CIJENA"] = df.apply(
-            lambda row: determine_final_price(row, config, debug_mode),
-            axis=1
+@st.cache_data(max_entries=16, show_spinner="📄 Pripremam datoteku...")
+def datoteka_rezultata(kljuc, format_, _df):
+    """Bajtovi izvezene tablice, dijele se po hashu rezultata (ista pretraga se ne izvozi ponovno)"""
+    return create_excel_download(_df) if format_ == "xlsx" else create_csv_download(_df)
+
+def gumb_za_preuzimanje(df, kljuc, format_):
+    """Datoteka se izrađuje tek kad je korisnik zatraži, a ne pri svakom prikazu rezultata"""
+    opis, ime_datoteke, mime = IZVOZ[format_]
+    pripremljeno = st.session_state.setdefault("pripremljeno", set())
+    if (kljuc, format_) not in pripremljeno:
+        st.button(
+            f"📄 Pripremi {opis}",
+            key=f"pripremi_{format_}",
+            on_click=pripremljeno.add,
+            args=((kljuc, format_),),
+            use_container_width=True
         )
-        
-        if barkod:
-            barkod_clean = barkod.strip()
-            df[config["columns"]["barkod"]] = df[config["columns"]["barkod"]].astype(str).str.replace('.0', '', regex=False)
-            mask = df[config["columns"]["barkod"]] == barkod_clean
-            
-            for _, row in df[mask].iterrows():
-                rezultati.append({
-                    "Trgovački lanac": ducan_naziv,
-                    "Traženi pojam": f"🔢 {barkod_clean}",
-                    "Šifra": row.get(config["columns"]["sifra"], ""),
-                    "Barkod": str(row.get(config["columns"]["barkod"], "")).replace('.0', ''),
-                    "Naziv proizvoda": row[config["columns"]["naziv"]],
-                    "Cijena (€)": row["CIJENA"],
-                    "Jedinica mjere": row.get(config["columns"]["jedinica"], ""),
-                    "Kategorija": row.get(config["columns"]["kategorija"], "")
-                })
-        
-        if pojmovi:
-            for pojam in pojmovi:
-                if not pojam.strip():
-                    continue
-                
-                regex = wildcard_to_regex(pojam)
-                mask = df[config["columns"]["naziv"]].astype(str).str.lower().str.contains(
-                    regex, na=False, regex=True
-                )
-                
-                for _, row in df[mask].iterrows():
-                    rezultati.append({
-                        "Trgovački lanac": ducan_naziv,
-                        "Traženi pojam": pojam,
-                        "Šifra": row.get(config["columns"]["sifra"], ""),
-                        "Barkod": str(row.get(config["columns"]["barkod"], "")).replace('.0', ''),
-                        "Naziv proizvoda": row[config["columns"]["naziv"]],
-                        "Cijena (€)": row["CIJENA"],
-                        "Jedinica mjere": row.get(config["columns"]["jedinica"], ""),
-                        "Kategorija": row.get(config["columns"]["kategorija"], "")
-                    })
-        
-        return rezultati
-        
-    except Exception as e:
-        st.error(f"{ducan_naziv}: {str(e)}")
-        return rezultati
+        return
+    
+    st.download_button(
+        f"📥 Preuzmi {opis}",
+        datoteka_rezultata(kljuc, format_, df),
+        ime_datoteke,
+        mime,
+        key=f"preuzmi_{format_}",
+        use_container_width=True
+    )
 
-def create_excel_download(df):
-    """Kreira Excel datoteku"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Rezultati')
-        ws = writer.sheets['Rezultati']
-        
-        header_fmt = writer.book.add_format({
-            'bold': True,
-            'bg_color': '#667eea',
-            'font_color': 'white',
-            'border': 1
-        })
-        
-        for col_num, value in enumerate(df.columns):
-            ws.write(0, col_num, value, header_fmt)
-        
-        for i, col in enumerate(df.columns):
-            max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
-            ws.set_column(i, i, max_len)
-    
-    return output.getvalue()
+def opis_verzije(pretraga):
+    """Kratki opis verzije podataka koja se pretražuje, po dućanu (vrijeme izmjene i početak content_hash-a)"""
+    return " · ".join(
+        f"{ime} {meta['izmijenjeno'].astimezone(ZAGREB):%d.%m. %H:%M} ({meta['content_hash'][:7]})"
+        for ime, meta in pretraga["metapodaci"].items()
+    )
+
+def prikazi_mjerenje(mjerenje, debug_mode, pretraga=None):
+    """Zatvara mjerenje pretrage; u debug modu prikazuje trajanje faza, memoriju i shemu po dućanima"""
+    ukupno = zavrsi_mjerenje(mjerenje)
+    if debug_mode:
+        with st.expander(f"⏱️ Faze pretrage ({ukupno:.0f} ms ukupno)", expanded=True):
+            st.dataframe(tablica_faza(mjerenje), use_container_width=True, hide_index=True)
+            c = statistika_cachea()
+            st.caption(
+                f"🗄️ Cache rezultata — pogoci: {c['pogoci']}, promašaji: {c['promasaji']}, "
+                f"spremljeno: {c['stavki']} ({c['mb']} MB), izbačeno: {c['izbaceni']}"
+            )
+            z = stanje_zagrijavanja()
+            vrijeme = lambda t: "—" if t is None else f"{datetime.fromtimestamp(t, ZAGREB):%d.%m. %H:%M:%S}"
+            st.caption(
+                f"🔥 Zagrijavanje — objavljeno: {vrijeme(z['objavljeno'])} (ukupno {z['objava']}), "
+                f"zadnja provjera: {vrijeme(z['provjera'])}, sljedeća: {vrijeme(z['sljedeca'])}"
+            )
+        if pretraga is not None:
+            ukupno_mb = sum(memorija_kataloga(pretraga["katalog"]).values())
+            with st.expander(f"🧠 Memorija kataloga (MB, ujedinjeni {ukupno_mb:.1f} MB)"):
+                st.dataframe(pretraga["memorija"], use_container_width=True, hide_index=True)
+            with st.expander("🧾 Shema cjenika (kolone po dućanu)"):
+                st.dataframe(pretraga["shema"], use_container_width=True, hide_index=True)
 
 # ──────────────────────────────────────────────────────────────────────
 # GLAVNI DIO APLIKACIJE
 # ──────────────────────────────────────────────────────────────────────
 
 def main():
+    # Katalog se gradi u pozadini od prvog otvaranja stranice i nakon svake jutarnje objave cjenika
+    izvor = izvor_cjenika()
+    pokreni_zagrijavanje(lambda: osvjezi_pretragu(izvor), lambda: datetime.now(ZAGREB))
+    
     # Initialize session state
     if 'barkod_value' not in st.session_state:
         st.session_state.barkod_value = ''
@@ -424,6 +415,12 @@ def main():
     
     with st.sidebar:
         debug_mode = st.checkbox("🐛 Debug mode", value=False)
+        priblizno = st.checkbox(
+            "🔤 Približna pretraga",
+            value=False,
+            help="Traži i slične nazive za sve pojmove (npr. nutela → nutella). "
+                 "Pojmovi bez ijednog pogotka uvijek se traže i približno."
+        )
     
     st.markdown(r"""
 <div class="info-box">
@@ -499,8 +496,13 @@ def main():
         p6 = st.text_input("Pojam 6", key="p6")
     
     if st.button("🔎 Pretraži cijene", use_container_width=True):
-        pojmovi = [p.strip() for p in [p1, p2, p3, p4, p5, p6] if p and p.strip()]
-        barkod = barkod_input.strip() if barkod_input else None
+        # Upit se pamti kako bi rezultati ostali prikazani i nakon reruna (npr. pripreme datoteke)
+        st.session_state.upit = ([p1, p2, p3, p4, p5, p6], barkod_input)
+    
+    if st.session_state.get("upit"):
+        unos, barkod_unos = st.session_state.upit
+        pojmovi = [p.strip() for p in unos if p and p.strip()]
+        barkod = barkod_unos.strip() if barkod_unos else None
         
         if not pojmovi and not barkod:
             st.error("Unesite barem jedan pojam ili barkod za pretragu.")
@@ -510,95 +512,75 @@ def main():
             st.warning("⚠️ Koristim samo barkod pretragu.")
             pojmovi = []
         
-        progress = st.progress(0)
-        status = st.empty()
-        svi_rez = []
+        mjerenje = zapocni_mjerenje(barkod or " | ".join(pojmovi))
+        pretraga, greske = dohvati_pretragu()
+        for ime, greska in greske.items():
+            st.error(f"{ime}: {greska}")
         
-        total = len(DUCANI_CONFIG)
+        df = None if pretraga is None else rezultati_pretrage(pretraga, pojmovi, barkod, priblizno)
         
-        for i, (ime, cfg) in enumerate(DUCANI_CONFIG.items()):
-            status.text(f"Pretražujem {ime}...")
-            rez = pretrazi_ducan(ime, cfg, pojmovi=pojmovi if not barkod else None, 
-                                barkod=barkod, debug_mode=debug_mode)
-            svi_rez.extend(rez)
-            progress.progress((i + 1) / total)
-        
-        progress.empty()
-        status.empty()
-        
-        if not svi_rez:
+        if df is None:
             st.warning("Nisu pronađeni rezultati.")
+            prikazi_mjerenje(mjerenje, debug_mode, pretraga)
             return
         
-        df = pd.DataFrame(svi_rez)
-        df = df.sort_values("Cijena (€)")
-        df = df.drop_duplicates(["Trgovački lanac", "Šifra"]).reset_index(drop=True)
-        
-        zeljeni_redoslijed = [
-            "Traženi pojam",
-            "Naziv proizvoda",
-            "Jedinica mjere",
-            "Cijena (€)",
-            "Trgovački lanac",
-            "Šifra",
-            "Barkod",
-            "Kategorija"
-        ]
-        
-        df = df[zeljeni_redoslijed]
-        
-        st.markdown('### 📊 Rezultati')
+        with faza("prikaz") as f:
+            f["redaka"] = len(df)
+            
+            st.markdown('### 📊 Rezultati')
+            if df["Traženi pojam"].str.contains(OZNAKA_PRIBLIZNO, regex=False).any():
+                st.info(f"🔤 Uključeni su i slični nazivi (označeni s „{OZNAKA_PRIBLIZNO.strip()}” u stupcu Traženi pojam).")
         
-        c1, c2, c3 = st.columns(3)
+            c1, c2, c3 = st.columns(3)
         
-        with c1:
-            st.markdown(f"""
+            with c1:
+                st.markdown(f"""
 <div class="stat-card">
     <div class="stat-number">{len(df)}</div>
     <div class="stat-label">Artikala</div>
 </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
         
-        with c2:
-            st.markdown(f"""
+            with c2:
+                st.markdown(f"""
 <div class="stat-card">
     <div class="stat-number">€{df["Cijena (€)"].min():.2f}</div>
     <div class="stat-label">Najjeftinije</div>
 </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
         
-        with c3:
-            st.markdown(f"""
+            with c3:
+                st.markdown(f"""
 <div class="stat-card">
     <div class="stat-number">{df["Trgovački lanac"].nunique()}</div>
     <div class="stat-label">Lanaca</div>
 </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("### 🏆 Najbolje ponude")
-        
-        df_show = df.copy()
-        df_show["Cijena (€)"] = df_show["Cijena (€)"].apply(
-            lambda x: f"€{x:.2f}" if pd.notna(x) else ""
-        )
-        df_show["Šifra"] = df_show["Šifra"].astype(str).str.replace(r'\.0$', '', regex=True)
-        
-        st.dataframe(
-            df_show,
-            use_container_width=True,
-            height=520,
-            hide_index=True
-        )
-        
-        excel = create_excel_download(df)
-        
-        st.download_button(
-            "📥 Preuzmi Excel",
-            excel,
-            "rezultati_cijene.xlsx",
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True
-        )
+                """, unsafe_allow_html=True)
+        
+            st.markdown("### 🏆 Najbolje ponude")
+        
+            df_show = df.copy()
+            df_show["Cijena (€)"] = df_show["Cijena (€)"].apply(
+                lambda x: f"€{x:.2f}" if pd.notna(x) else ""
+            )
+            df_show["Šifra"] = df_show["Šifra"].fillna("").astype(str).str.replace(r'\.0$', '', regex=True)
+        
+            st.dataframe(
+                df_show,
+                use_container_width=True,
+                height=520,
+                hide_index=True
+            )
+        
+        kljuc = hash_rezultata(df)
+        e1, e2 = st.columns(2)
+        with e1:
+            gumb_za_preuzimanje(df, kljuc, "xlsx")
+        with e2:
+            gumb_za_preuzimanje(df, kljuc, "csv")
+        
+        st.caption(f"🗓️ Verzija podataka: {opis_verzije(pretraga)}")
+        prikazi_mjerenje(mjerenje, debug_mode, pretraga)
     
     st.markdown("""
 <div class="footer">
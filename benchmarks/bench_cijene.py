@@ -0,0 +1,95 @@
+"""Benchmark: obrada cijena redak-po-redak (stari kod) naspram vektorizirane obrade.
+
+Pokretanje iz korijena repozitorija:
+
+    python benchmarks/bench_cijene.py --redaka 500000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pretraga import convert_price, determine_final_price  # noqa: E402
+
+
+def stari_convert_price(val):
+    """convert_price prije vektorizacije (poziva se kroz Series.apply)"""
+    if pd.isna(val) or val == '':
+        return None
+    try:
+        cleaned = str(val).replace(',', '.').replace(' ', '').strip()
+        if cleaned == '':
+            return None
+        return float(cleaned)
+    except:
+        return None
+
+
+def stari_determine_final_price(row):
+    """determine_final_price prije vektorizacije (poziva se kroz df.apply(axis=1))"""
+    akcijska = row["akcijska"]
+    maloprodajna = row["maloprodajna"]
+    if pd.notna(akcijska) and akcijska > 0:
+        return akcijska
+    if pd.notna(maloprodajna) and maloprodajna > 0:
+        return maloprodajna
+    return None
+
+
+def generiraj_cijene(n, seed=0):
+    """Stupci cijena kakvi dolaze iz CSV-a: decimalni zarez, prazne akcijske cijene"""
+    rng = np.random.default_rng(seed)
+    maloprodajna = np.char.replace(np.round(rng.uniform(0.2, 80, n), 2).astype(str), ".", ",")
+    akcijska = np.where(rng.random(n) < 0.15, np.char.replace(
+        np.round(rng.uniform(0.1, 60, n), 2).astype(str), ".", ","), "")
+    return pd.DataFrame({"maloprodajna": maloprodajna, "akcijska": akcijska}, dtype=object)
+
+
+def stari(df):
+    out = pd.DataFrame({
+        "maloprodajna": df["maloprodajna"].apply(stari_convert_price),
+        "akcijska": df["akcijska"].apply(stari_convert_price),
+    })
+    return out.apply(stari_determine_final_price, axis=1)
+
+
+def novi(df):
+    return determine_final_price(
+        convert_price(df["maloprodajna"]), convert_price(df["akcijska"]), "fillna"
+    )
+
+
+def izmjeri(fn, df, ponavljanja):
+    najbolje = float("inf")
+    for _ in range(ponavljanja):
+        t0 = time.perf_counter()
+        rezultat = fn(df)
+        najbolje = min(najbolje, time.perf_counter() - t0)
+    return najbolje, rezultat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redaka", type=int, default=200_000)
+    parser.add_argument("--ponavljanja", type=int, default=3)
+    args = parser.parse_args()
+
+    df = generiraj_cijene(args.redaka)
+    t_stari, r_stari = izmjeri(stari, df, args.ponavljanja)
+    t_novi, r_novi = izmjeri(novi, df, args.ponavljanja)
+
+    assert np.allclose(r_stari.astype(float), r_novi, equal_nan=True), "rezultati se razlikuju"
+
+    print(f"{'varijanta':<12}{'sekundi':>10}{'redaka/s':>16}")
+    print(f"{'stari':<12}{t_stari:>10.3f}{args.redaka / t_stari:>16,.0f}")
+    print(f"{'novi':<12}{t_novi:>10.3f}{args.redaka / t_novi:>16,.0f}")
+    print(f"ubrzanje: {t_stari / t_novi:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark: vršna memorija i trajanje ingesta po dućanu - pandas i pyarrow parser, cijela datoteka i blokovi.
+
+Cjenik se generira i svaka varijanta izvodi u zasebnom procesu: vršna memorija je porast
+najvećeg RSS-a iznad procesa koji je već učitao CSV (tracemalloc ne vidi memoriju Arrow
+parsera, a Linux najveći RSS roditelja prenosi na proces dijete).
+
+Pokretanje iz korijena repozitorija:
+
+    python benchmarks/bench_ingest.py --redaka 1000000 --ducani Konzum Spar
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generator import generiraj_cjenik  # noqa: E402
+from pretraga import DUCANI_CONFIG, ingest_ducan  # noqa: E402
+from pretraga.config import BLOK_REDAKA  # noqa: E402
+from pretraga.ingest import normaliziraj_blok  # noqa: E402
+from pretraga.mjerenje import faza, tablica_faza, vrsna_memorija_mb, zapocni_mjerenje, zavrsi_mjerenje  # noqa: E402
+from pretraga.shema import razrijesi_kolone  # noqa: E402
+
+
+def stari_ingest(content, config):
+    """Ingest prije čitanja u blokovima: decode u jedan str, StringIO i jedan read_csv"""
+    with faza("parsiranje"):
+        df = pd.read_csv(StringIO(content.decode(config["encoding"])), sep=config["separator"], on_bad_lines='skip')
+    df.columns = df.columns.str.strip()
+    return normaliziraj_blok(df, razrijesi_kolone(df.columns, config)[0], config["price_logic"])
+
+
+def varijante(blok_redaka):
+    """{opis: fn(content, config)} za usporedbu"""
+    return {
+        "str + StringIO (staro)": stari_ingest,
+        "pandas, cijela datoteka": lambda c, cfg: ingest_ducan(c, cfg, None, "pandas"),
+        f"pandas, blokovi od {blok_redaka:,}": lambda c, cfg: ingest_ducan(c, cfg, blok_redaka, "pandas"),
+        "pyarrow, cijela datoteka": lambda c, cfg: ingest_ducan(c, cfg, None, "pyarrow"),
+        f"pyarrow, blokovi od {blok_redaka:,}": lambda c, cfg: ingest_ducan(c, cfg, blok_redaka, "pyarrow"),
+    }
+
+
+def izmjeri(putanja, ducan, opis, blok_redaka):
+    """Jedna varijanta u ovom procesu: trajanje ingesta i parsiranja (s) te porast vršnog RSS-a (MB)"""
+    with open(putanja, "rb") as f:
+        content = f.read()
+    gc.collect()
+    prije = vrsna_memorija_mb()
+
+    mjerenje = zapocni_mjerenje(opis)
+    t0 = time.perf_counter()
+    varijante(blok_redaka)[opis](content, DUCANI_CONFIG[ducan])
+    trajanje = time.perf_counter() - t0
+    zavrsi_mjerenje(mjerenje)
+
+    faze = tablica_faza(mjerenje)
+    parsiranje = faze.loc[faze["Faza"] == "parsiranje", "Trajanje (ms)"].sum() / 1000
+    return {"s": trajanje, "parsiranje_s": parsiranje, "mb": vrsna_memorija_mb() - prije}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redaka", type=int, default=500_000)
+    parser.add_argument("--ducani", nargs="+", choices=list(DUCANI_CONFIG), default=list(DUCANI_CONFIG))
+    parser.add_argument("--blok", type=int, default=BLOK_REDAKA or 100_000)
+    # Interno, u zasebnom procesu: generiranje cjenika i jedna varijanta nad već generiranim CSV-om
+    parser.add_argument("--generiraj", nargs=2, metavar=("CSV", "DUCAN"), help=argparse.SUPPRESS)
+    parser.add_argument("--jedna", nargs=3, metavar=("CSV", "DUCAN", "VARIJANTA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generiraj:
+        putanja, ducan = args.generiraj
+        with open(putanja, "wb") as f:
+            f.write(generiraj_cjenik(ducan, args.redaka))
+        return
+    if args.jedna:
+        print(json.dumps(izmjeri(*args.jedna, args.blok)))
+        return
+
+    with tempfile.TemporaryDirectory() as direktorij:
+        for ducan in args.ducani:
+            putanja = os.path.join(direktorij, DUCANI_CONFIG[ducan]["filename"])
+            subprocess.run(
+                [sys.executable, __file__, "--redaka", str(args.redaka), "--generiraj", putanja, ducan], check=True
+            )
+            print(f"\n{ducan}: {args.redaka:,} redaka, CSV {os.path.getsize(putanja) / 1e6:.0f} MB "
+                  f"(vršna memorija ne uključuje sam CSV)")
+            print(f"  {'':<32}{'ingest':>9}{'parsiranje':>12}{'vršna':>10}")
+
+            for opis in varijante(args.blok):
+                izlaz = subprocess.run(
+                    [sys.executable, __file__, "--blok", str(args.blok), "--jedna", putanja, ducan, opis],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                r = json.loads(izlaz.strip().splitlines()[-1])
+                print(f"  {opis:<32}{r['s']:7.2f} s{r['parsiranje_s']:10.2f} s{r['mb']:7.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: memorija i latencija trigram indeksa naziva naspram punog regex skeniranja.
+
+Pokretanje iz korijena repozitorija (veličina je broj redaka jednog dućana):
+
+    python benchmarks/bench_trigram.py --redaka 30000 --faktor 10
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generator import JEDINICE, MARKE, OPISI, PROIZVODI  # noqa: E402
+from pretraga import izgradi_indeks_naziva, redovi_za_pojam, wildcard_to_regex  # noqa: E402
+from pretraga.normalizacija import normaliziraj_tekst  # noqa: E402
+
+UPITI = ["*kava*", "*mlijeko 3.5*", "*dukat*", "*ožujsko*", "*čokolada*milka*", "*500g*", "*0,5 ?*", "*1 l*"]
+
+# (naziv, pojam): wildcard ili nedovršena jedinica usred količine - naziv mora biti pogođen
+REGRESIJE = [
+    ("Pivo 0,5 l", "pivo 0,*"), ("Voda 1,5 l", "voda 1,?"), ("Mlijeko 1 L", "mlijeko 1 ?"),
+    ("Mlijeko 1 L", "mlijeko 1l"), ("Mlijeko 1L", "mlijeko 1 l"), ("Jaja 10 kom", "jaja 10 k*"),
+    ("Jaja 10 kom", "jaja 10 ko"), ("Jaja 10 komada", "jaja 10 kom"), ("Sir 500 g", "*500 *"),
+]
+
+
+def generiraj_nazive(n, seed=0):
+    """Nasumični nazivi proizvoda oblika 'proizvod marka opis jedinica #šifra'"""
+    rng = np.random.default_rng(seed)
+    dijelovi = [
+        rng.choice(PROIZVODI, n), rng.choice(MARKE, n), rng.choice(OPISI, n),
+        rng.choice(JEDINICE, n), rng.integers(1000, 99999, n).astype(str),
+    ]
+    return pd.DataFrame({"naziv": [" ".join(d) for d in zip(*dijelovi)]})
+
+
+def velicina_indeksa(indeks):
+    """Zauzeće indeksa u MB: sortirani nazivi, redoslijed i trigram polja"""
+    nazivi = sum(sys.getsizeof(n) for n in indeks["nazivi"]) + sys.getsizeof(indeks["nazivi"])
+    trigrami = sum(polje.nbytes for polje in indeks["trigrami"])
+    return nazivi / 1e6, (indeks["redoslijed"].nbytes + trigrami) / 1e6
+
+
+def provjeri_regresije():
+    """Svaki naziv iz REGRESIJE pogađa svoj pojam, i preko indeksa i skeniranjem"""
+    df = pd.DataFrame({"naziv": [naziv for naziv, _ in REGRESIJE]})
+    indeks = izgradi_indeks_naziva(df)
+    for i, (naziv, upit) in enumerate(REGRESIJE):
+        assert re.match(wildcard_to_regex(upit), normaliziraj_tekst(naziv)), (naziv, upit)
+        assert i in redovi_za_pojam(upit, indeks), (naziv, upit)
+    print(f"{len(REGRESIJE)} regresijskih pojmova pogađa svoje nazive")
+
+
+def izmjeri(redaka):
+    df = generiraj_nazive(redaka)
+
+    t0 = time.perf_counter()
+    indeks = izgradi_indeks_naziva(df)
+    izgradnja = time.perf_counter() - t0
+    mb_nazivi, mb_indeks = velicina_indeksa(indeks)
+
+    print(f"\n{redaka:,} redaka: izgradnja {izgradnja:.2f} s, "
+          f"nazivi {mb_nazivi:.1f} MB, redoslijed+trigrami {mb_indeks:.1f} MB")
+    print(f"{'upit':<22}{'pogodaka':>10}{'skeniranje ms':>16}{'indeks ms':>12}")
+
+    # Nazivi se normaliziraju jednom, izvan mjerenja - kao i indeks, skeniranje mjeri samo traženje
+    nazivi = df["naziv"].astype(str).map(normaliziraj_tekst)
+    for upit in UPITI:
+        t0 = time.perf_counter()
+        maska = nazivi.str.contains(wildcard_to_regex(upit), na=False, regex=True)
+        skeniranje = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        redovi = redovi_za_pojam(upit, indeks)
+        trigram = time.perf_counter() - t0
+
+        assert np.array_equal(np.flatnonzero(maska), redovi), upit
+        print(f"{upit:<22}{len(redovi):>10,}{skeniranje * 1000:>16.1f}{trigram * 1000:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redaka", type=int, default=30_000)
+    parser.add_argument("--faktor", type=int, default=10)
+    args = parser.parse_args()
+
+    provjeri_regresije()
+    izmjeri(args.redaka)
+    izmjeri(args.redaka * args.faktor)
+
+
+if __name__ == "__main__":
+    main()
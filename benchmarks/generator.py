@@ -0,0 +1,104 @@
+"""Sintetički cjenici u dijalektu svakog dućana iz DUCANI_CONFIG.
+
+Poštuje separator, encoding i nazive kolona dućana, cijene piše s decimalnim
+zarezom, a akcijska cijena je za većinu artikala prazna. Kaufland (bez zadanih
+kolona cijena) dobiva stupac koji se prepoznaje po "maloprod".
+
+    python benchmarks/generator.py data/ --redaka 50000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pretraga import DUCANI_CONFIG  # noqa: E402
+
+PROIZVODI = ["mlijeko", "jogurt", "sir", "kava", "čokolada", "keksi", "sok", "voda", "pivo",
+             "šampon", "deterdžent", "tjestenina", "riža", "brašno", "ulje", "maslac", "šunka"]
+MARKE = ["dukat", "vindija", "meggle", "franck", "kraš", "podravka", "jamnica", "nutella",
+         "milka", "barcaffe", "ožujsko", "persil", "nivea", "zvijezda", "k-plus", "đuro"]
+OPISI = ["trajno", "svježe", "light", "bio", "classic", "extra", "family pack", "mini",
+         "0.9%", "2.8%", "3.5%", "gazirana", "negazirana", "integralni", "mljevena"]
+JEDINICE = ["1l", "0.5l", "1.5l", "200g", "250g", "400g", "500g", "1kg", "6x0.33l"]
+KATEGORIJE = ["Mliječni proizvodi", "Kava i čaj", "Slatkiši", "Pića", "Kozmetika",
+              "Sredstva za čišćenje", "Tjestenina i riža", "Mesni proizvodi"]
+JEDINICE_MJERE = ["kom", "kg", "l", "g"]
+
+KAUFLAND_MALOPRODAJNA = "maloprodajna cijena(EUR)"
+UDIO_AKCIJA = 0.15
+UDIO_BEZ_BARKODA = 0.02
+
+
+def ean13(n, rng):
+    """n ispravnih EAN-13 barkodova (hrvatski prefiks 385) s kontrolnom znamenkom"""
+    tijelo = 385_000_000_000 + rng.choice(999_999_999, n, replace=False)
+    znamenke = (tijelo[:, None] // 10 ** np.arange(11, -1, -1)) % 10
+    tezine = np.tile([1, 3], 6)
+    kontrolna = (10 - (znamenke * tezine).sum(axis=1) % 10) % 10
+    return (tijelo * 10 + kontrolna).astype(str)
+
+
+def cijene_sa_zarezom(centi):
+    """Cijene u centima → tekst s decimalnim zarezom ("1,29")"""
+    return np.array([f"{c // 100},{c % 100:02d}" for c in centi.tolist()], dtype=object)
+
+
+def generiraj_tablicu(n, seed=0):
+    """Kanonska tablica artikala (naziv, šifra, barkod, kategorija, jedinica, cijene kao tekst)"""
+    rng = np.random.default_rng(seed)
+    naziv = [" ".join(d) for d in zip(
+        rng.choice(PROIZVODI, n), rng.choice(MARKE, n), rng.choice(OPISI, n), rng.choice(JEDINICE, n)
+    )]
+    barkod = ean13(n, rng)
+    barkod[rng.random(n) < UDIO_BEZ_BARKODA] = ""
+
+    maloprodajna = rng.integers(20, 8000, n)
+    akcijska = cijene_sa_zarezom((maloprodajna * rng.uniform(0.6, 0.95, n)).astype(np.int64))
+    akcijska[rng.random(n) >= UDIO_AKCIJA] = ""
+
+    return pd.DataFrame({
+        "naziv": naziv,
+        "sifra": rng.choice(10_000_000, n, replace=False) + 100_000,
+        "barkod": barkod,
+        "kategorija": rng.choice(KATEGORIJE, n),
+        "jedinica": rng.choice(JEDINICE_MJERE, n),
+        "maloprodajna": cijene_sa_zarezom(maloprodajna),
+        "akcijska": akcijska,
+    })
+
+
+def generiraj_cjenik(ducan_naziv, n, seed=0):
+    """Sadržaj CSV datoteke (bytes) u dijalektu zadanog dućana"""
+    config = DUCANI_CONFIG[ducan_naziv]
+    tablica = generiraj_tablicu(n, seed)
+
+    kolone = dict(config["columns"])
+    if kolone["maloprodajna"] is None:
+        kolone["maloprodajna"] = KAUFLAND_MALOPRODAJNA
+    kolone = {kljuc: naziv for kljuc, naziv in kolone.items() if naziv}
+
+    csv = tablica[list(kolone)].rename(columns=kolone).to_csv(index=False, sep=config["separator"])
+    return csv.encode(config["encoding"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("direktorij", help="gdje zapisati CSV datoteke (npr. data/)")
+    parser.add_argument("--redaka", type=int, default=20_000, help="redaka po dućanu")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.direktorij, exist_ok=True)
+    for i, (ducan_naziv, config) in enumerate(DUCANI_CONFIG.items()):
+        putanja = os.path.join(args.direktorij, config["filename"])
+        with open(putanja, "wb") as f:
+            f.write(generiraj_cjenik(ducan_naziv, args.redaka, args.seed + i))
+        print(f"{putanja}: {args.redaka:,} redaka")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark suite: ingest, osvježavanje, indeksi, pretrage i Excel izvoz nad sintetičkim cjenicima.
+
+Za svaku veličinu (redaka po dućanu) generira cjenike svih dućana u njihovom
+dijalektu, mjeri faze i dodaje rezultat u benchmarks/rezultati/suite.jsonl te
+ga uspoređuje sa zadnjim mjerenjem iste veličine.
+
+    python benchmarks/suite.py --velicine 10000 100000
+    python benchmarks/suite.py --velicine 2000000 --ducani Konzum Kaufland
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+KORIJEN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KORIJEN)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generator import generiraj_cjenik  # noqa: E402
+from pretraga import (  # noqa: E402
+    DUCANI_CONFIG,
+    LazniDropbox,
+    canonical_gtin,
+    create_excel_download,
+    dropbox_izvor,
+    ingest_ducan,
+    izgradi_barkod_indeks,
+    izgradi_indeks_naziva,
+    izgradi_rjecnik,
+    izvjestaj_memorije,
+    pretrazi_barkod,
+    pretrazi_pojmove,
+    spoji_kataloge,
+    sredi_rezultate,
+    ucitaj_kataloge_iz_izvora,
+)
+
+REZULTATI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rezultati", "suite.jsonl")
+
+PREFIKS = ["mlijeko"]
+INFIKS = ["*kava*"]
+VISE_POJMOVA = ["mlijeko", "*kava*", "sir ?ukat*", "*čokolada*milka*", "jogurt*", "*500g*"]
+TIPFELERI = ["*nutela*", "jogrut*", "*cokolda*milak*"]
+
+# (objavljeni barkod, upisani barkod, prikaz): GTIN-ovi se nadopunjuju, interni kodovi ostaju kako su objavljeni
+REGRESIJE_BARKODA = [
+    ("385", "385", "385"), ("00385", "00385", "00385"), ("00012345", "00012345", "00012345"),
+    ("3850102000000", "03850102000000", "3850102000000"), ("012345678905", "012345678905.0", "0012345678905"),
+]
+
+
+def provjeri_barkodove():
+    """Svaki objavljeni barkod iz REGRESIJE_BARKODA pronalazi se upisanim i prikazuje kako treba"""
+    objavljeni = [objavljen for objavljen, _, _ in REGRESIJE_BARKODA]
+    katalog = pd.DataFrame({
+        "lanac": "Test", "sifra": objavljeni, "barkod": canonical_gtin(pd.Series(objavljeni)),
+        "naziv": "artikl", "CIJENA": 1.0, "jedinica": "kom", "kategorija": ""
+    })
+    indeks = izgradi_barkod_indeks(katalog)
+    for objavljen, upisan, prikaz in REGRESIJE_BARKODA:
+        rezultati = pretrazi_barkod(upisan, katalog, indeks)
+        assert rezultati and list(rezultati[0]["Šifra"]) == [objavljen], (objavljen, upisan)
+        assert list(rezultati[0]["Barkod"]) == [prikaz], (objavljen, list(rezultati[0]["Barkod"]))
+    # Kratki interni kod nije isti proizvod kao GTIN s vodećim nulama
+    assert not pretrazi_barkod("00000385", katalog, indeks)
+
+
+def najbolje_vrijeme(fn, ponavljanja=3):
+    """Najkraće vrijeme (s) i rezultat zadnjeg poziva"""
+    najbolje = float("inf")
+    for _ in range(ponavljanja):
+        t0 = time.perf_counter()
+        rezultat = fn()
+        najbolje = min(najbolje, time.perf_counter() - t0)
+    return najbolje, rezultat
+
+
+def pretrazi_sve(katalog, indeks, pojmovi, rjecnik=None):
+    tablice = pretrazi_pojmove(katalog, indeks, pojmovi, rjecnik)
+    return sredi_rezultate(tablice) if tablice else None
+
+
+def izmjeri_osvjezavanje(cjenici, redaka):
+    """Učitavanje kroz lažni Dropbox: hladno (preuzimanje, ingest, disk cache), toplo i nakon nove revizije jednog dućana"""
+    lazni = LazniDropbox({DUCANI_CONFIG[ime]["filename"]: content for ime, content in cjenici.items()})
+    izvor = dropbox_izvor(lambda: lazni)
+    metrike = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for kljuc in ("hladno_s", "toplo_s"):
+            t0 = time.perf_counter()
+            ucitaj_kataloge_iz_izvora(izvor, list(cjenici), cache_dir)
+            metrike[kljuc] = time.perf_counter() - t0
+
+        prvi = next(iter(cjenici))
+        lazni.files_upload(generiraj_cjenik(prvi, redaka, seed=len(cjenici)), f"/{DUCANI_CONFIG[prvi]['filename']}")
+        t0 = time.perf_counter()
+        ucitaj_kataloge_iz_izvora(izvor, list(cjenici), cache_dir)
+        metrike["nova_revizija_s"] = time.perf_counter() - t0
+    return metrike
+
+
+def izmjeri_velicinu(redaka, ducani):
+    cjenici = {ime: generiraj_cjenik(ime, redaka, seed=i) for i, ime in enumerate(ducani)}
+    metrike = {"mb_csv": round(sum(map(len, cjenici.values())) / 1e6, 1)}
+
+    t0 = time.perf_counter()
+    katalozi = {ime: ingest_ducan(cjenici[ime], DUCANI_CONFIG[ime]) for ime in ducani}
+    metrike["ingest_s"] = time.perf_counter() - t0
+    metrike["ingest_redaka_s"] = redaka * len(ducani) / metrike["ingest_s"]
+    metrike["mb_katalog"] = izvjestaj_memorije(katalozi)["Ukupno"].sum()
+
+    metrike.update(izmjeri_osvjezavanje(cjenici, redaka))
+
+    t0 = time.perf_counter()
+    katalog = spoji_kataloge(katalozi)
+    metrike["spajanje_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indeks = izgradi_indeks_naziva(katalog)
+    metrike["indeks_naziva_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rjecnik = izgradi_rjecnik(katalog["kljuc_naziva"].cat.categories)
+    metrike["rjecnik_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    barkod_indeks = izgradi_barkod_indeks(katalog)
+    metrike["indeks_barkoda_s"] = time.perf_counter() - t0
+
+    rng = np.random.default_rng(0)
+    prvi = next(iter(katalozi.values()))["barkod"].to_numpy()
+    barkodovi = [str(b) for b in rng.choice(prvi[prvi > 0], 200)]
+    t0 = time.perf_counter()
+    for barkod in barkodovi:
+        pretrazi_barkod(barkod, katalog, barkod_indeks)
+    metrike["barkod_us"] = (time.perf_counter() - t0) / len(barkodovi) * 1e6
+
+    metrike["prefiks_ms"] = najbolje_vrijeme(lambda: pretrazi_sve(katalog, indeks, PREFIKS))[0] * 1000
+    metrike["infiks_ms"] = najbolje_vrijeme(lambda: pretrazi_sve(katalog, indeks, INFIKS))[0] * 1000
+    t, rezultat = najbolje_vrijeme(lambda: pretrazi_sve(katalog, indeks, VISE_POJMOVA))
+    metrike["vise_pojmova_ms"] = t * 1000
+    metrike["vise_pojmova_redaka"] = 0 if rezultat is None else len(rezultat)
+    metrike["tipfeleri_ms"] = najbolje_vrijeme(lambda: pretrazi_sve(katalog, indeks, TIPFELERI, rjecnik))[0] * 1000
+
+    if rezultat is not None:
+        metrike["excel_s"] = najbolje_vrijeme(lambda: create_excel_download(rezultat), ponavljanja=1)[0]
+
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in metrike.items()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=KORIJEN, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def zadnje_mjerenje(redaka, ducani):
+    """Zadnji spremljeni zapis s istom veličinom i skupom dućana"""
+    if not os.path.exists(REZULTATI):
+        return None
+    zadnji = None
+    with open(REZULTATI, encoding="utf-8") as f:
+        for redak in f:
+            zapis = json.loads(redak)
+            if zapis["redaka"] == redaka and zapis["ducani"] == ducani:
+                zadnji = zapis
+    return zadnji
+
+
+def ispisi(zapis, prethodni):
+    print(f"\n{zapis['redaka']:,} redaka × {len(zapis['ducani'])} dućana")
+    for kljuc, vrijednost in zapis["metrike"].items():
+        redak = f"  {kljuc:<22}{vrijednost:>14,.3f}"
+        if prethodni and kljuc in prethodni["metrike"] and prethodni["metrike"][kljuc]:
+            promjena = vrijednost / prethodni["metrike"][kljuc] - 1
+            redak += f"   {promjena:+.0%} vs {prethodni['commit'] or prethodni['datum']}"
+        print(redak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--velicine", type=int, nargs="+", default=[10_000, 100_000],
+                        help="redaka po dućanu (npr. 10000 100000 1000000 2000000)")
+    parser.add_argument("--ducani", nargs="+", choices=list(DUCANI_CONFIG), default=list(DUCANI_CONFIG))
+    parser.add_argument("--ne-spremaj", action="store_true", help="samo ispiši, bez zapisa u suite.jsonl")
+    args = parser.parse_args()
+
+    provjeri_barkodove()
+    os.makedirs(os.path.dirname(REZULTATI), exist_ok=True)
+    for redaka in args.velicine:
+        zapis = {
+            "datum": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "redaka": redaka,
+            "ducani": args.ducani,
+            "metrike": izmjeri_velicinu(redaka, args.ducani),
+        }
+        ispisi(zapis, zadnje_mjerenje(redaka, args.ducani))
+        if not args.ne_spremaj:
+            with open(REZULTATI, "a", encoding="utf-8") as f:
+                f.write(json.dumps(zapis, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Pretraga cijena bez Streamlita: konfiguracija, ingest, indeksi i upiti nad cjenicima dućana"""
+from .cache import ucitaj_ili_ingestiraj
+from .config import CACHE_DIR, DUCANI_CONFIG
+from .export import create_csv_download, create_excel_download, hash_rezultata
+from .index import izgradi_barkod_indeks, izgradi_indeks_naziva
+from .ingest import (
+    canonical_gtin,
+    convert_price,
+    determine_final_price,
+    format_gtin,
+    ingest_ducan,
+    izvjestaj_memorije,
+    memorija_kataloga,
+)
+from .izvori import LazniDropbox, dropbox_izvor, lokalni_izvor, napravi_izvor
+from .katalog import pripremi_pretragu, spoji_kataloge
+from .lokalno import (
+    ucitaj_katalog_iz_izvora,
+    ucitaj_kataloge_iz_izvora,
+    ucitaj_lokalne_kataloge,
+    ucitaj_lokalni_katalog,
+    ucitaj_pretragu_iz_izvora,
+)
+from .priblizno import izgradi_rjecnik, priblizni_pojmovi
+from .query import (
+    pretrazi_barkod,
+    pretrazi_pojmove,
+    redovi_za_pojam,
+    redovi_za_pojmove,
+    sredi_rezultate,
+    wildcard_to_regex,
+)
+from .shema import izvjestaj_sheme, razrijesi_kolone
+
+__all__ = [
+    "CACHE_DIR",
+    "DUCANI_CONFIG",
+    "LazniDropbox",
+    "canonical_gtin",
+    "convert_price",
+    "create_csv_download",
+    "create_excel_download",
+    "determine_final_price",
+    "dropbox_izvor",
+    "format_gtin",
+    "hash_rezultata",
+    "ingest_ducan",
+    "izgradi_barkod_indeks",
+    "izgradi_indeks_naziva",
+    "izgradi_rjecnik",
+    "izvjestaj_memorije",
+    "izvjestaj_sheme",
+    "lokalni_izvor",
+    "memorija_kataloga",
+    "napravi_izvor",
+    "pretrazi_barkod",
+    "pretrazi_pojmove",
+    "priblizni_pojmovi",
+    "pripremi_pretragu",
+    "razrijesi_kolone",
+    "redovi_za_pojam",
+    "redovi_za_pojmove",
+    "spoji_kataloge",
+    "sredi_rezultate",
+    "ucitaj_ili_ingestiraj",
+    "ucitaj_katalog_iz_izvora",
+    "ucitaj_kataloge_iz_izvora",
+    "ucitaj_lokalne_kataloge",
+    "ucitaj_lokalni_katalog",
+    "ucitaj_pretragu_iz_izvora",
+    "wildcard_to_regex",
+]
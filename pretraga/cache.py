@@ -0,0 +1,115 @@
+"""Lokalni cache obrađenih kataloga (Arrow IPC) i metapodataka izvornih datoteka"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from .config import CACHE_DIR, DUCANI_CONFIG, FORMAT_KATALOGA
+from .ingest import ingest_ducan
+from .mjerenje import faza, za_ducan
+
+logger = logging.getLogger(__name__)
+
+# Ključ metapodataka Arrow sheme s izvještajem o razrješavanju kolona (pretraga/shema.py)
+META_SHEMA = b"pretraga.shema"
+
+
+def putanja_manifesta(filename, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{filename}.json")
+
+
+def procitaj_manifest(filename, cache_dir=CACHE_DIR):
+    """Zadnji poznati metapodaci datoteke s diska ili None"""
+    try:
+        with open(putanja_manifesta(filename, cache_dir), encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["izmijenjeno"] = datetime.fromisoformat(manifest["izmijenjeno"])
+        return manifest
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def spremi_manifest(filename, meta, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    privremena = putanja_manifesta(filename, cache_dir) + ".tmp"
+    with open(privremena, "w", encoding="utf-8") as f:
+        json.dump({**meta, "izmijenjeno": meta["izmijenjeno"].isoformat()}, f)
+    os.replace(privremena, putanja_manifesta(filename, cache_dir))
+
+
+def putanja_kataloga(ducan_naziv, verzija, cache_dir=CACHE_DIR):
+    """Datoteka kataloga na disku; ključ su revizija podataka i hash konfiguracije dućana"""
+    konfiguracija = json.dumps([FORMAT_KATALOGA, DUCANI_CONFIG[ducan_naziv]], sort_keys=True, default=dict)
+    kljuc = hashlib.sha1(konfiguracija.encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{ducan_naziv}-{kljuc}-{verzija}.arrow")
+
+
+def procitaj_katalog_s_diska(putanja):
+    """Memory-mapped čitanje kataloga iz Arrow IPC datoteke; None ako ne postoji"""
+    if not os.path.exists(putanja):
+        return None
+    try:
+        with faza("disk_cache") as f, pa.memory_map(putanja) as izvor:
+            # Tekst ostaje u Arrow memoriji (kao kod ingesta), kategorije ostaju kategorije
+            tablica = pa.ipc.open_file(izvor).read_all()
+            katalog = tablica.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+            meta = tablica.schema.metadata or {}
+            if META_SHEMA in meta:
+                katalog.attrs["shema"] = json.loads(meta[META_SHEMA])
+            f["redaka"] = len(katalog)
+        return katalog
+    except Exception as e:
+        logger.warning("Ne mogu pročitati %s: %s", putanja, e)
+        return None
+
+
+def spremi_katalog_na_disk(katalog, ducan_naziv, putanja):
+    """Atomski zapisuje katalog (nekomprimirani Arrow IPC) i briše starije verzije istog dućana"""
+    cache_dir = os.path.dirname(putanja)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tablica = pa.Table.from_pandas(katalog, preserve_index=False)
+        # Arrow ne čuva DataFrame.attrs - izvještaj o shemi ide u metapodatke sheme tablice
+        if "shema" in katalog.attrs:
+            tablica = tablica.replace_schema_metadata({
+                **(tablica.schema.metadata or {}),
+                META_SHEMA: json.dumps(katalog.attrs["shema"], ensure_ascii=False).encode()
+            })
+        privremena = putanja + ".tmp"
+        with pa.OSFile(privremena, "wb") as izlaz, pa.ipc.new_file(izlaz, tablica.schema) as writer:
+            writer.write_table(tablica)
+        os.replace(privremena, putanja)
+    except Exception as e:
+        logger.warning("Ne mogu zapisati %s: %s", putanja, e)
+        return
+
+    for datoteka in os.listdir(cache_dir):
+        stara = os.path.join(cache_dir, datoteka)
+        if datoteka.startswith(f"{ducan_naziv}-") and datoteka.endswith(".arrow") and stara != putanja:
+            try:
+                os.remove(stara)
+            except OSError:
+                pass
+
+
+def ucitaj_ili_ingestiraj(ducan_naziv, verzija, dohvati_sadrzaj, cache_dir=CACHE_DIR):
+    """Katalog iz lokalnog cachea ili, ako ga nema, ingest sadržaja koji vrati dohvati_sadrzaj().
+
+    dohvati_sadrzaj se poziva samo na promašaj, tako da topli start ne preuzima ništa;
+    cache_dir=None isključuje disk cache.
+    """
+    config = DUCANI_CONFIG[ducan_naziv]
+    with za_ducan(ducan_naziv):
+        if cache_dir is None:
+            return ingest_ducan(dohvati_sadrzaj(), config)
+
+        putanja = putanja_kataloga(ducan_naziv, verzija, cache_dir)
+        katalog = procitaj_katalog_s_diska(putanja)
+        if katalog is None:
+            katalog = ingest_ducan(dohvati_sadrzaj(), config)
+            spremi_katalog_na_disk(katalog, ducan_naziv, putanja)
+        return katalog
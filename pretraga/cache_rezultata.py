@@ -0,0 +1,67 @@
+"""Zajednički (za cijeli proces) LRU cache gotovih tablica rezultata, ograničen brojem i veličinom"""
+import threading
+from collections import OrderedDict
+
+from .config import CACHE_REZULTATA_MB, CACHE_REZULTATA_STAVKI
+from .normalizacija import normaliziraj_upit
+
+_rezultati = OrderedDict()  # ključ → (tablica ili None, veličina u bajtovima)
+_lock = threading.Lock()
+_stanje = {"pogoci": 0, "promasaji": 0, "izbaceni": 0, "bajtova": 0}
+
+
+def kljuc_upita(nacin, upit, verzija):
+    """Ključ cachea: način pretrage, normalizirani upit (pojmovi ili barkod) i verzija podataka"""
+    if isinstance(upit, str):
+        upit = [upit]
+    # Pojmovi s istim normaliziranim ključem ("Čokolada", "cokolada") daju iste rezultate
+    normalizirani = tuple(dict.fromkeys(normaliziraj_upit(p) for p in upit if p.strip()))
+    return nacin, normalizirani, verzija
+
+
+def dohvati_rezultat(kljuc):
+    """(True, tablica) ako je rezultat u cacheu (tablica je None kad nema pogodaka), inače (False, None)"""
+    with _lock:
+        if kljuc not in _rezultati:
+            _stanje["promasaji"] += 1
+            return False, None
+        _rezultati.move_to_end(kljuc)
+        _stanje["pogoci"] += 1
+        return True, _rezultati[kljuc][0]
+
+
+def spremi_rezultat(kljuc, df):
+    """Sprema tablicu (ne smije se kasnije mijenjati); najdavnije korišteni izbacuju se preko limita"""
+    velicina = 0 if df is None else int(df.memory_usage(index=True, deep=True).sum())
+    if velicina > CACHE_REZULTATA_MB * 1e6:
+        return
+
+    with _lock:
+        if kljuc in _rezultati:
+            _stanje["bajtova"] -= _rezultati.pop(kljuc)[1]
+        _rezultati[kljuc] = (df, velicina)
+        _stanje["bajtova"] += velicina
+
+        while len(_rezultati) > CACHE_REZULTATA_STAVKI or _stanje["bajtova"] > CACHE_REZULTATA_MB * 1e6:
+            _, (_, izbacena) = _rezultati.popitem(last=False)
+            _stanje["bajtova"] -= izbacena
+            _stanje["izbaceni"] += 1
+
+
+def isprazni_cache_rezultata():
+    """Briše sve spremljene rezultate (npr. nakon ingesta novih cjenika); brojači ostaju"""
+    with _lock:
+        _rezultati.clear()
+        _stanje["bajtova"] = 0
+
+
+def statistika_cachea():
+    """Brojači pogodaka/promašaja/izbacivanja te broj i veličina (MB) spremljenih rezultata"""
+    with _lock:
+        return {
+            "pogoci": _stanje["pogoci"],
+            "promasaji": _stanje["promasaji"],
+            "izbaceni": _stanje["izbaceni"],
+            "stavki": len(_rezultati),
+            "mb": round(_stanje["bajtova"] / 1e6, 1)
+        }
@@ -0,0 +1,103 @@
+"""Skupna pretraga iz naredbenog retka: datoteka s pojmovima/barkodovima → CSV, JSON ili Excel.
+
+Svaki redak ulazne datoteke je zasebna pretraga: niz od 8-14 znamenki traži se kao
+barkod, sve ostalo kao wildcard pojam. Prazni reci i reci koji počinju s # se preskaču.
+
+    python -m pretraga upiti.txt --podaci data/ --izlaz rezultati.csv
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+from .config import CACHE_DIR, DUCANI_CONFIG
+from .export import create_excel_download
+from .katalog import pripremi_pretragu
+from .lokalno import ucitaj_lokalne_kataloge
+from .query import pretrazi_barkod, pretrazi_pojmove, sredi_rezultate
+
+FORMATI = ("csv", "json", "xlsx")
+
+
+def procitaj_upite(putanja):
+    """(pojmovi, barkodovi) iz datoteke s jednim upitom po retku"""
+    pojmovi, barkodovi = [], []
+    with open(putanja, encoding="utf-8") as f:
+        for redak in f:
+            upit = redak.strip()
+            if not upit or upit.startswith("#"):
+                continue
+            if re.fullmatch(r"\d{8,14}", upit):
+                barkodovi.append(upit)
+            else:
+                pojmovi.append(upit)
+    return pojmovi, barkodovi
+
+
+def skupna_pretraga(katalozi, pojmovi, barkodovi, priblizno=False):
+    """Tablica rezultata za sve upite; duplikati se uklanjaju unutar svakog upita zasebno"""
+    pretraga = pripremi_pretragu({ime: katalog for ime, (_, katalog) in katalozi.items()})
+    tablice = pretrazi_pojmove(pretraga["katalog"], pretraga["indeks"], pojmovi, pretraga["rjecnik"], priblizno)
+    for barkod in barkodovi:
+        tablice.extend(pretrazi_barkod(barkod, pretraga["katalog"], pretraga["barkodovi"]))
+
+    if not tablice:
+        return None
+    df = sredi_rezultate(tablice, po_pojmu=True)
+    return df.sort_values(["Traženi pojam", "Cijena (€)"], kind="stable").reset_index(drop=True)
+
+
+def zapisi(df, putanja, format_):
+    if format_ == "csv":
+        df.to_csv(putanja, index=False, encoding="utf-8-sig")
+    elif format_ == "json":
+        df.to_json(putanja, orient="records", force_ascii=False, indent=1)
+    else:
+        with open(putanja, "wb") as f:
+            f.write(create_excel_download(df))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pretraga",
+        description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("upiti", help="datoteka s jednim pojmom ili barkodom po retku")
+    parser.add_argument("--podaci", default="data", help="direktorij s CSV cjenicima (default: data)")
+    parser.add_argument("--izlaz", default="rezultati.csv", help="izlazna datoteka (default: rezultati.csv)")
+    parser.add_argument("--format", choices=FORMATI, help="format izlaza (default: prema ekstenziji)")
+    parser.add_argument("--ducani", nargs="+", choices=list(DUCANI_CONFIG), help="samo navedeni dućani")
+    parser.add_argument("--priblizno", action="store_true",
+                        help="svi pojmovi traže se i sa slično napisanim riječima (inače samo pojmovi bez pogodaka)")
+    parser.add_argument("--bez-cachea", action="store_true", help=f"ne koristi disk cache ({CACHE_DIR})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    format_ = args.format or os.path.splitext(args.izlaz)[1].lstrip(".").lower()
+    if format_ not in FORMATI:
+        parser.error(f"nepoznat format izlaza '{format_}', zadaj --format")
+
+    t0 = time.perf_counter()
+    pojmovi, barkodovi = procitaj_upite(args.upiti)
+    katalozi = ucitaj_lokalne_kataloge(
+        args.podaci, args.ducani, cache_dir=None if args.bez_cachea else CACHE_DIR
+    )
+    if not katalozi:
+        print(f"Nema nijednog cjenika u {args.podaci}", file=sys.stderr)
+        return 1
+    t_ucitavanje = time.perf_counter() - t0
+
+    df = skupna_pretraga(katalozi, pojmovi, barkodovi, args.priblizno)
+    if df is None:
+        print("Nisu pronađeni rezultati.", file=sys.stderr)
+        return 1
+    zapisi(df, args.izlaz, format_)
+
+    print(
+        f"{len(pojmovi) + len(barkodovi)} upita, {len(katalozi)} lanaca, {len(df)} redaka → {args.izlaz} "
+        f"(učitavanje {t_ucitavanje:.2f} s, ukupno {time.perf_counter() - t0:.2f} s)",
+        file=sys.stderr
+    )
+    return 0
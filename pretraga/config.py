@@ -0,0 +1,145 @@
+"""Konfiguracija dućana i zajedničke postavke pretrage"""
+import os
+from types import MappingProxyType
+
+
+def zamrzni(vrijednost):
+    """Read-only pogled na (ugniježđeni) dict konfiguracije"""
+    if isinstance(vrijednost, dict):
+        return MappingProxyType({k: zamrzni(v) for k, v in vrijednost.items()})
+    return vrijednost
+
+
+DUCANI_CONFIG = {
+    "Plodine": {
+        "filename": "plodine_jucer.csv",
+        "separator": ";",
+        "encoding": "windows-1250",
+        "columns": {
+            "naziv": "Naziv proizvoda",
+            "sifra": "Sifra proizvoda",
+            "barkod": "Barkod",
+            "kategorija": "Kategorija proizvoda",
+            "maloprodajna": "Maloprodajna cijena",
+            "akcijska": "MPC za vrijeme posebnog oblika prodaje",
+            "jedinica": "Jedinica mjere"
+        },
+        "price_logic": "fillna"
+    },
+    "Eurospin": {
+        "filename": "eurospin_jucer.csv",
+        "separator": ";",
+        "encoding": "windows-1250",
+        "columns": {
+            "naziv": "NAZIV_PROIZVODA",
+            "sifra": "ŠIFRA_PROIZVODA",
+            "barkod": "BARKOD",
+            "kategorija": "KATEGORIJA_PROIZVODA",
+            "maloprodajna": "MALOPROD.CIJENA(EUR)",
+            "akcijska": "MPC_POSEB.OBLIK_PROD",
+            "jedinica": "JEDINICA_MJERE"
+        },
+        "price_logic": "eurospin"
+    },
+    "Kaufland": {
+        "filename": "kaufland_jucer.csv",
+        "separator": "\t",
+        "encoding": "utf-8",
+        "columns": {
+            "naziv": "naziv proizvoda",
+            "sifra": "šifra proizvoda",
+            "barkod": "barkod",
+            "kategorija": "kategorija proizvoda",
+            "maloprodajna": None,
+            "akcijska": None,
+            "jedinica": "jedinica mjere"
+        },
+        "price_logic": "fillna"
+    },
+    "Konzum": {
+        "filename": "konzum_jucer.csv",
+        "separator": ",",
+        "encoding": "utf-8",
+        "columns": {
+            "naziv": "NAZIV PROIZVODA",
+            "sifra": "ŠIFRA PROIZVODA",
+            "barkod": "BARKOD",
+            "kategorija": "KATEGORIJA PROIZVODA",
+            "maloprodajna": "MALOPRODAJNA CIJENA",
+            "akcijska": "MPC ZA VRIJEME POSEBNOG OBLIKA PRODAJE",
+            "jedinica": "JEDINICA MJERE"
+        },
+        "price_logic": "fillna"
+    },
+    "Lidl": {
+        "filename": "lidl_jucer.csv",
+        "separator": ",",
+        "encoding": "windows-1250",
+        "columns": {
+            "naziv": "NAZIV",
+            "sifra": "ŠIFRA",
+            "barkod": "BARKOD",
+            "kategorija": "KATEGORIJA_PROIZVODA",
+            "maloprodajna": "MALOPRODAJNA_CIJENA",
+            "akcijska": "MPC_ZA_VRIJEME_POSEBNOG_OBLIKA_PRODAJE",
+            "jedinica": "JEDINICA_MJERE"
+        },
+        "price_logic": "fillna"
+    },
+    "Spar": {
+        "filename": "spar_jucer.csv",
+        "separator": ";",
+        "encoding": "windows-1250",
+        "columns": {
+            "naziv": "naziv",
+            "sifra": "šifra",
+            "barkod": "barkod",
+            "kategorija": "kategorija proizvoda",
+            "maloprodajna": "MPC (EUR)",
+            "akcijska": "MPC za vrijeme posebnog oblika prodaje (EUR)",
+            "jedinica": "jedinica mjere"
+        },
+        "price_logic": "spar"
+    }
+}
+
+# Dijeli se među sesijama i dretvama učitavanja - nitko je ne smije mijenjati
+DUCANI_CONFIG = zamrzni(DUCANI_CONFIG)
+
+# Odakle se čitaju cjenici: "dropbox", "lokalno" (direktorij PODACI_DIR, bez mreže) ili
+# "lazni" (Dropbox u memoriji procesa napunjen iz PODACI_DIR, za rad bez mreže)
+IZVOR_CJENIKA = os.environ.get("PRETRAGA_IZVOR", "dropbox")
+PODACI_DIR = os.environ.get(
+    "PRETRAGA_PODACI",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+
+# Lokalni cache obrađenih kataloga (Arrow IPC), preživljava restart i redeploy
+CACHE_DIR = os.environ.get(
+    "PRETRAGA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+FORMAT_KATALOGA = 6  # povećati pri svakoj promjeni ingest_ducan koja mijenja tablicu
+
+# Zajednički cache gotovih rezultata pretrage (LRU)
+CACHE_REZULTATA_STAVKI = 256
+CACHE_REZULTATA_MB = 64
+
+# Ingest čita CSV u blokovima od toliko redaka (None = cijela datoteka odjednom)
+BLOK_REDAKA = int(os.environ.get("PRETRAGA_BLOK_REDAKA", 100_000)) or None
+
+# CSV parser ingesta: "pandas" ili "pyarrow" (višedretveni; odbijene datoteke čitaju se pandasom)
+PARSER_CSV = os.environ.get("PRETRAGA_PARSER", "pandas")
+
+# Cjenici se na Dropbox objavljuju pon–sub oko 8:20 (zagrebačko vrijeme); u tom prozoru
+# zagrijavanje često provjerava revizije, izvan njega rijetko
+OBJAVA_CJENIKA = (8, 20)
+DANI_OBJAVE = (0, 1, 2, 3, 4, 5)  # datetime.weekday(): 0 = ponedjeljak
+PROZOR_OBJAVE_MIN = 90
+PROVJERA_U_PROZORU = 60  # sekundi
+PROVJERA_IZVAN_PROZORA = 30 * 60  # sekundi
+PROVJERA_NAKON_GRESKE = 60  # sekundi; nepotpun katalog ne čeka sljedeću redovnu provjeru
+
+# Približna pretraga (tipfeleri): budžet za traženje sličnih riječi i najviše varijanti po pojmu
+PRIBLIZNO_BUDZET_MS = 50
+PRIBLIZNO_VARIJANTI = 3
@@ -0,0 +1,65 @@
+"""Izvoz tablice rezultata (Excel i CSV)"""
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+import xlsxwriter
+
+from .mjerenje import faza
+
+NAJVECA_SIRINA = 60  # znakova; dugi nazivi se ne razvlače preko cijelog ekrana
+
+
+def hash_rezultata(df):
+    """Kratki hash sadržaja tablice rezultata (ključ za cache izvezenih datoteka)"""
+    vrijednosti = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    kljuc = hashlib.sha1(vrijednosti.tobytes())
+    kljuc.update("|".join(df.columns).encode())
+    return kljuc.hexdigest()[:16]
+
+
+def sirina_stupca(stupac):
+    """Širina stupca u znakovima, bez formatiranja svake ćelije redak po redak"""
+    if isinstance(stupac.dtype, pd.CategoricalDtype):
+        duljine = stupac.cat.categories.astype(str).str.len()
+    elif pd.api.types.is_numeric_dtype(stupac):
+        duljine = pd.Series([len(f"{v:.2f}") for v in (stupac.min(), stupac.max()) if pd.notna(v)])
+    else:
+        duljine = stupac.dropna().astype(str).str.len()
+    najdulji = int(duljine.max()) if len(duljine) else 0
+    return min(max(najdulji, len(stupac.name)) + 2, NAJVECA_SIRINA)
+
+
+def create_excel_download(df):
+    """Kreira Excel datoteku; reci se zapisuju redom (constant_memory) pa memorija ne raste s brojem redaka"""
+    output = BytesIO()
+    with faza("excel") as f:
+        f["redaka"] = len(df)
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        ws = workbook.add_worksheet('Rezultati')
+
+        header_fmt = workbook.add_format({
+            'bold': True,
+            'bg_color': '#667eea',
+            'font_color': 'white',
+            'border': 1
+        })
+
+        for i, col in enumerate(df.columns):
+            ws.set_column(i, i, sirina_stupca(df[col]))
+        ws.write_row(0, 0, list(df.columns), header_fmt)
+
+        # Prazne ćelije (NaN/NA) ostaju prazne
+        reci = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        for red, vrijednosti in enumerate(reci, start=1):
+            ws.write_row(red, 0, vrijednosti)
+
+        workbook.close()
+    return output.getvalue()
+
+
+def create_csv_download(df):
+    """Kreira CSV datoteku (UTF-8 s BOM-om da je Excel ispravno otvara); lakša od Excela za velike tablice"""
+    with faza("csv") as f:
+        f["redaka"] = len(df)
+        return df.to_csv(index=False).encode("utf-8-sig")
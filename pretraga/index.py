@@ -0,0 +1,91 @@
+"""Indeksi nad (ujedinjenim) katalogom: sortirani nazivi, trigrami i barkodovi"""
+import re
+
+import numpy as np
+
+from .mjerenje import faza
+from .normalizacija import kljuc_naziva
+
+
+def trigram_kljucevi(znakovi):
+    """Ključevi trigrama (tri code pointa u jednom uint64) za niz code pointova"""
+    znakovi = znakovi.astype(np.uint64)
+    return (znakovi[:-2] << np.uint64(42)) | (znakovi[1:-1] << np.uint64(21)) | znakovi[2:]
+
+
+def izgradi_trigram_indeks(nazivi):
+    """Invertirani indeks trigram → pozicije naziva, spremljen kao (ključevi, početci, pozicije)"""
+    spojeno = "\x00".join(nazivi) + "\x00"
+    znakovi = np.frombuffer(spojeno.encode("utf-32-le"), dtype=np.uint32)
+    duljine = np.fromiter(map(len, nazivi), dtype=np.int64, count=len(nazivi)) + 1
+    pozicija_naziva = np.repeat(np.arange(len(nazivi), dtype=np.int32), duljine)
+
+    # Trigrami koji prelaze granicu dvaju naziva (sadrže separator) se odbacuju
+    valjani = (znakovi[:-2] != 0) & (znakovi[1:-1] != 0) & (znakovi[2:] != 0)
+    kljucevi = trigram_kljucevi(znakovi)[valjani]
+    pozicije = pozicija_naziva[:-2][valjani]
+
+    # Stabilno sortiranje čuva rastući poredak pozicija unutar svakog trigrama
+    red = np.argsort(kljucevi, kind="stable")
+    kljucevi, pozicije = kljucevi[red], pozicije[red]
+    jedinstveni = np.ones(len(kljucevi), dtype=bool)
+    jedinstveni[1:] = (kljucevi[1:] != kljucevi[:-1]) | (pozicije[1:] != pozicije[:-1])
+    kljucevi, pozicije = kljucevi[jedinstveni], pozicije[jedinstveni]
+
+    pocetci = np.flatnonzero(np.r_[True, kljucevi[1:] != kljucevi[:-1]])
+    return kljucevi[pocetci], np.r_[pocetci, len(kljucevi)], pozicije
+
+
+def trigram_kandidati(pojam, trigrami):
+    """Pozicije naziva koji sadrže sve trigrame fiksnih dijelova pojma; None ako pojam nema trigrama"""
+    kljucevi, pocetci, pozicije = trigrami
+    liste = []
+    for dio in re.split(r'[*?]', pojam):
+        if len(dio) < 3:
+            continue
+        for kljuc in np.unique(trigram_kljucevi(np.frombuffer(dio.encode("utf-32-le"), dtype=np.uint32))):
+            i = np.searchsorted(kljucevi, kljuc)
+            if i == len(kljucevi) or kljucevi[i] != kljuc:
+                return np.array([], dtype=np.int32)
+            liste.append(pozicije[pocetci[i]:pocetci[i + 1]])
+
+    if not liste:
+        return None
+
+    liste.sort(key=len)
+    kandidati = liste[0]
+    for lista in liste[1:]:
+        kandidati = np.intersect1d(kandidati, lista, assume_unique=True)
+        if len(kandidati) == 0:
+            break
+    return kandidati
+
+
+def kljucevi_naziva(katalog):
+    """Normalizirani ključevi naziva kao niz; koristi se stupac izračunat pri ingestu kad postoji"""
+    kljuc = katalog["kljuc_naziva"] if "kljuc_naziva" in katalog else kljuc_naziva(katalog["naziv"])
+    return kljuc.cat.categories.to_numpy(dtype=object)[kljuc.cat.codes.to_numpy()]
+
+
+def izgradi_indeks_naziva(katalog):
+    """Sortirani normalizirani ključevi naziva s pripadnim redovima i trigram indeksom nad njima"""
+    with faza("indeks") as f:
+        nazivi = kljucevi_naziva(katalog)
+        redoslijed = np.argsort(nazivi, kind="stable")
+        nazivi = nazivi[redoslijed].tolist()
+        f["redaka"] = len(nazivi)
+        return {
+            "nazivi": nazivi,
+            "redoslijed": redoslijed,
+            "trigrami": izgradi_trigram_indeks(nazivi)
+        }
+
+
+def izgradi_barkod_indeks(katalog):
+    """Sortirani GTIN-ovi kataloga s pripadnim redovima; redovi bez barkoda se preskaču"""
+    with faza("indeks", ducan="barkodovi") as f:
+        gtin = katalog["barkod"].to_numpy()
+        redovi = np.flatnonzero(gtin)
+        red = np.argsort(gtin[redovi], kind="stable")
+        f["redaka"] = len(redovi)
+        return {"gtin": gtin[redovi][red], "redovi": redovi[red]}
@@ -0,0 +1,260 @@
+"""Ingest: sirovi CSV dućana → kanonska tablica s cijenama i barkodovima"""
+import csv
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import union_categoricals
+
+from .config import BLOK_REDAKA, PARSER_CSV
+from .mjerenje import faza, vrsna_memorija_mb
+from .normalizacija import kljuc_naziva
+from .shema import razrijesi_kolone
+
+logger = logging.getLogger(__name__)
+
+# Sve varijante "price_logic" iz DUCANI_CONFIG trenutno dijele isto pravilo
+PRICE_LOGIC = ("fillna", "eurospin", "spar")
+
+# Kompaktni zapis kataloga: tekstovi s puno ponavljanja su kategorijski (svaka vrijednost
+# spremljena jednom, kao i normalizirani ključ naziva), šifra je Arrow string, cijene
+# float32 (zaokružene na cente kod prikaza), barkod int64
+KATEGORIJSKI_STUPCI = ("naziv", "kategorija", "jedinica")
+STUPCI_CIJENA = ("maloprodajna", "akcijska", "CIJENA")
+
+# Duljine GTIN-a (EAN-8, UPC-A, EAN-13, GTIN-14); ostali brojčani kodovi su interni kodovi trgovca
+DULJINE_GTIN = (8, 12, 13, 14)
+
+# "pandas": C parser u blokovima; "pyarrow": višedretveni Arrow parser (datoteke koje
+# odbije, npr. s novim retkom unutar navodnika, čitaju se pandasom)
+PARSERI = ("pandas", "pyarrow")
+
+
+def convert_price(values):
+    """Konvertira stupac cijena (string, npr. "1,29") u float, neispravne vrijednosti postaju NaN"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    cleaned = (
+        values.astype(str)
+        .str.replace(',', '.', regex=False)
+        .str.replace(' ', '', regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def canonical_gtin(values):
+    """Kanonski barkod kao int64; 0 znači da barkod nedostaje ili nije ispravan.
+
+    GTIN (EAN-8/12/13/14) je pozitivan broj, pa isti proizvod ima isti ključ bez obzira na
+    vodeće nule; interni kod trgovca druge duljine sprema se kao -int("1" + kod), kako bi
+    ostao pretraživ i prikazao se točno kako je objavljen.
+    """
+    cleaned = values.astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+    valid = cleaned.str.fullmatch(r'\d{1,14}')
+    kljuc = cleaned.where(cleaned.str.len().isin(DULJINE_GTIN), "-1" + cleaned)
+    return pd.to_numeric(kljuc.where(valid), errors='coerce').fillna(0).astype('int64')
+
+
+def format_gtin(gtin):
+    """Prikaz stupca barkodova: EAN-8 ostaje 8 znamenki, ostali GTIN-ovi nadopunjuju se na EAN-13/GTIN-14,
+    a interni kodovi prikazuju se kako su objavljeni"""
+    znamenke = gtin.abs().astype(str)
+    return pd.Series(
+        np.where(gtin == 0, "", np.where(gtin < 0, znamenke.str[1:],
+                 np.where(gtin < 10**8, znamenke.str.zfill(8), znamenke.str.zfill(13)))),
+        index=gtin.index
+    )
+
+
+def gtin_broj(barkod):
+    """Kanonski barkod jednog upisanog koda (kao canonical_gtin, bez pandasa); 0 ako nije ispravan"""
+    cleaned = re.sub(r'\.0+$', '', str(barkod).strip())
+    if not re.fullmatch(r'\d{1,14}', cleaned):
+        return 0
+    return int(cleaned) if len(cleaned) in DULJINE_GTIN else -int("1" + cleaned)
+
+
+def format_gtin_broja(gtin):
+    """Prikaz jednog barkoda, po istom pravilu kao format_gtin"""
+    if gtin == 0:
+        return ""
+    if gtin < 0:
+        return str(-gtin)[1:]
+    return str(gtin).zfill(8 if gtin < 10**8 else 13)
+
+
+def determine_final_price(maloprodajna, akcijska, price_logic="fillna"):
+    """Određuje finalnu cijenu: pozitivna akcijska, inače pozitivna maloprodajna, inače NaN"""
+    if price_logic not in PRICE_LOGIC:
+        raise ValueError(f"nepoznat price_logic: {price_logic}")
+
+    maloprodajna = maloprodajna.where(maloprodajna > 0)
+    return akcijska.where(akcijska > 0, maloprodajna)
+
+
+def normaliziraj_blok(df, kolone, price_logic):
+    """Blok sirovog CSV-a → kanonski stupci s GTIN-om i izračunatom cijenom (kolone iz razrijesi_kolone)"""
+    with faza("kolone") as f:
+        katalog = pd.DataFrame(index=df.index)
+        for kljuc in ["naziv", "sifra", "barkod", "kategorija", "jedinica"]:
+            col = kolone[kljuc]
+            katalog[kljuc] = df[col] if col is not None else ""
+        f["redaka"] = len(katalog)
+
+    with faza("normalizacija") as f:
+        katalog["barkod"] = canonical_gtin(katalog["barkod"])
+        for kljuc in KATEGORIJSKI_STUPCI:
+            # Kategorije su uvijek object, bez obzira je li blok iz pandas ili pyarrow parsera
+            katalog[kljuc] = katalog[kljuc].fillna("").astype(object).astype("category")
+        katalog["kljuc_naziva"] = kljuc_naziva(katalog["naziv"])
+        katalog["sifra"] = katalog["sifra"].astype("string[pyarrow]")
+        f["redaka"] = len(katalog)
+
+    with faza("cijene") as f:
+        katalog["maloprodajna"] = convert_price(df[kolone["maloprodajna"]])
+        if kolone["akcijska"]:
+            katalog["akcijska"] = convert_price(df[kolone["akcijska"]])
+        else:
+            katalog["akcijska"] = float("nan")
+
+        katalog["CIJENA"] = determine_final_price(
+            katalog["maloprodajna"], katalog["akcijska"], price_logic
+        )
+        for kljuc in STUPCI_CIJENA:
+            katalog[kljuc] = katalog[kljuc].astype("float32")
+        f["redaka"] = int(katalog["CIJENA"].notna().sum())
+    return katalog
+
+
+def spoji_blokove(blokovi):
+    """Spaja kanonske blokove; kategorijski stupci spajaju se unijom kategorija (ostaju kompaktni)"""
+    if len(blokovi) == 1:
+        return blokovi[0]
+    return pd.DataFrame({
+        kljuc: pd.Series(union_categoricals([b[kljuc] for b in blokovi]))
+        if isinstance(blokovi[0][kljuc].dtype, pd.CategoricalDtype)
+        else pd.concat([b[kljuc] for b in blokovi], ignore_index=True)
+        for kljuc in blokovi[0].columns
+    })
+
+
+def memorija_kataloga(katalog):
+    """Zauzeće memorije po stupcu kataloga u MB (uključujući sadržaj tekstova)"""
+    return (katalog.memory_usage(index=False, deep=True) / 1e6).round(2).to_dict()
+
+
+def izvjestaj_memorije(katalozi):
+    """Tablica zauzeća memorije (MB) po dućanu i stupcu za {dućan: katalog}"""
+    df = pd.DataFrame({ime: memorija_kataloga(k) for ime, k in katalozi.items()}).T
+    df["Ukupno"] = df.sum(axis=1)
+    df.insert(0, "Redaka", [len(k) for k in katalozi.values()])
+    return df.rename_axis("Dućan").reset_index()
+
+
+def citaj_pandas(content, config, blok_redaka=BLOK_REDAKA):
+    """Blokovi sirovog CSV-a dekodirani i parsirani izravno iz bytes ili mmap-a (svi stupci kao tekst)"""
+    opcije = {
+        "encoding": config["encoding"],
+        "sep": config["separator"],
+        "dtype": str,
+        "on_bad_lines": 'skip'
+    }
+    # Arrow BufferReader čita izravno iz sadržaja (BytesIO bi kopirao mmap, a sam mmap pandas ne dekodira)
+    izvor = pa.BufferReader(pa.py_buffer(content))
+    if blok_redaka is None:
+        yield pd.read_csv(izvor, **opcije)
+    else:
+        yield from pd.read_csv(izvor, chunksize=blok_redaka, **opcije)
+
+
+def citaj_pyarrow(content, config):
+    """Cijeli CSV kao Arrow tablica (svi stupci kao tekst), parsiran višedretveno bez kopije sadržaja"""
+    import pyarrow.csv as pacsv
+
+    # Nazivi kolona čitaju se iz zaglavlja kako bi svi stupci ostali tekst (šifre s vodećim nulama)
+    kraj = content.find(b"\n")
+    zaglavlje = content[:kraj if kraj >= 0 else None].decode(config["encoding"]).rstrip("\r")
+    nazivi = next(csv.reader([zaglavlje], delimiter=config["separator"]))
+
+    return pacsv.read_csv(
+        pa.py_buffer(content),
+        read_options=pacsv.ReadOptions(
+            column_names=nazivi, skip_rows=1, encoding=config["encoding"], use_threads=True
+        ),
+        # Kao on_bad_lines='skip' kod pandasa, samo što se preskaču i reci s premalo polja
+        parse_options=pacsv.ParseOptions(
+            delimiter=config["separator"], invalid_row_handler=lambda redak: "skip"
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={naziv: pa.string() for naziv in nazivi}, strings_can_be_null=True
+        )
+    )
+
+
+def citaj_blokove(content, config, blok_redaka=BLOK_REDAKA, parser=PARSER_CSV):
+    """Blokovi sirovog CSV-a kao DataFrameovi tekstualnih stupaca, očišćenih naziva kolona.
+
+    Uz parser="pyarrow" datoteka se parsira odjednom u Arrow tablicu, a blokovi su njezini
+    odsječci (tekst ostaje u Arrow memoriji); ako Arrow datoteku odbije, čita se pandasom.
+    """
+    if parser not in PARSERI:
+        raise ValueError(f"nepoznat parser: {parser}")
+
+    blokovi = None
+    if parser == "pyarrow":
+        try:
+            tablica = citaj_pyarrow(content, config)
+        except Exception as e:
+            logger.warning("pyarrow ne može parsirati CSV (%s), čitam pandasom", e)
+        else:
+            korak = blok_redaka or max(tablica.num_rows, 1)
+            blokovi = (
+                tablica.slice(pocetak, korak).to_pandas()
+                for pocetak in range(0, tablica.num_rows, korak)
+            )
+    if blokovi is None:
+        blokovi = citaj_pandas(content, config, blok_redaka)
+
+    for df in blokovi:
+        df.columns = df.columns.str.replace("\ufeff", "", regex=False).str.strip()
+        yield df
+
+
+def ingest_ducan(content, config, blok_redaka=BLOK_REDAKA, parser=PARSER_CSV):
+    """Pretvara sirovi CSV dućana u kanonsku tablicu s izračunatom cijenom.
+
+    Svaki blok od blok_redaka redaka odmah se svodi na kanonske stupce, pa se u memoriji
+    nikad ne drži cijela datoteka kao str niti svi sirovi stupci odjednom;
+    blok_redaka=None čita cijelu datoteku odjednom. parser je jedan od PARSERI.
+    """
+    vrsna_prije = vrsna_memorija_mb()
+    blokovi_csv = citaj_blokove(content, config, blok_redaka, parser)
+    blokovi = []
+    kolone = izvjestaj = None
+    while True:
+        with faza("parsiranje") as f:
+            df = next(blokovi_csv, None)
+            f["redaka"] = 0 if df is None else len(df)
+        if df is None:
+            break
+        if kolone is None:
+            with faza("shema") as f:
+                kolone, izvjestaj = razrijesi_kolone(df.columns, config)
+                f["kolona"] = len(df.columns)
+        blokovi.append(normaliziraj_blok(df, kolone, config["price_logic"]))
+
+    with faza("spajanje") as f:
+        if not blokovi:
+            raise ValueError("CSV nema nijednog retka")
+        katalog = spoji_blokove(blokovi)
+        katalog.attrs["shema"] = [dict(zapis) for zapis in izvjestaj]
+        f["blokova"] = len(blokovi)
+        f["redaka"] = len(katalog)
+        f["katalog_mb"] = round(sum(memorija_kataloga(katalog).values()), 1)
+        if vrsna_prije is not None:
+            # Porast vršnog RSS-a procesa tijekom ovog ingesta; 0 ako je raniji posao već dosegnuo više
+            f["porast_vrsne_mb"] = round(vrsna_memorija_mb() - vrsna_prije, 1)
+    return katalog
@@ -0,0 +1,186 @@
+"""Izvori cjenika: odakle se čitaju CSV datoteke dućana (Dropbox, lokalni direktorij, lažni Dropbox).
+
+Izvor je dict s nazivom i dvije funkcije:
+
+- "metapodaci"(filename) → {"rev", "content_hash", "izmijenjeno"}, bez preuzimanja sadržaja
+- "preuzmi"(filename, rev=None) → sadržaj datoteke (bytes ili read-only mmap)
+
+content_hash je u svim izvorima Dropboxov hash sadržaja, pa isti cjenik ima istu
+verziju (i isti zapis u disk cacheu) bez obzira odakle je pročitan.
+"""
+import hashlib
+import mmap
+import os
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import SimpleNamespace
+
+from .mjerenje import faza
+
+IZVORI = ("dropbox", "lokalno", "lazni")
+
+# Dropbox hash sadržaja: SHA-256 nad spojenim SHA-256 blokova od 4 MB
+BLOK_HASHA = 4 * 1024 * 1024
+
+
+def dropbox_content_hash(content):
+    """Dropboxov content_hash za bytes ili mmap"""
+    pogled = memoryview(content)
+    blokovi = b"".join(
+        hashlib.sha256(pogled[i:i + BLOK_HASHA]).digest() for i in range(0, len(pogled), BLOK_HASHA)
+    )
+    return hashlib.sha256(blokovi).hexdigest()
+
+
+def dropbox_izvor(klijent, naziv="Dropbox"):
+    """Izvor nad Dropboxom; klijent() vraća (dijeljeni) dropbox.Dropbox s važećim tokenom"""
+    try:
+        from dropbox.exceptions import AuthError
+    except ImportError:
+        # Lažni Dropbox radi i bez dropbox paketa
+        AuthError = ()
+
+    def metapodaci(filename):
+        try:
+            metadata = klijent().files_get_metadata(f"/{filename}")
+        except AuthError as e:
+            raise RuntimeError(f"Dropbox autentikacija nije uspjela: {e}") from e
+        return {
+            "rev": metadata.rev,
+            "content_hash": metadata.content_hash,
+            # Dropbox vraća UTC vrijeme bez vremenske zone
+            "izmijenjeno": metadata.server_modified.replace(tzinfo=timezone.utc)
+        }
+
+    def preuzmi(filename, rev=None):
+        try:
+            with faza("preuzimanje") as f:
+                _, response = klijent().files_download(f"/{filename}", rev=rev)
+                f["bajtova"] = len(response.content)
+            return response.content
+        except AuthError as e:
+            raise RuntimeError(f"Dropbox autentikacija nije uspjela: {e}") from e
+
+    return {"naziv": naziv, "metapodaci": metapodaci, "preuzmi": preuzmi}
+
+
+@lru_cache(maxsize=64)
+def _hash_datoteke(putanja, izmijenjeno_ns, velicina):
+    # Ključ uključuje vrijeme izmjene i veličinu - datoteka se ponovno čita samo kad se promijeni
+    with open(putanja, "rb") as datoteka:
+        if velicina == 0:
+            return dropbox_content_hash(b"")
+        with mmap.mmap(datoteka.fileno(), 0, access=mmap.ACCESS_READ) as sadrzaj:
+            return dropbox_content_hash(sadrzaj)
+
+
+def _rev_datoteke(stat):
+    # Lokalna "revizija": vrijeme izmjene i veličina datoteke
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def lokalni_izvor(direktorij):
+    """Izvor nad lokalnim direktorijem (npr. data/ ili dijeljeni disk on-prem); datoteke se čitaju kao mmap.
+
+    Direktorij čuva samo trenutnu verziju datoteke: preuzimanje zadanog reva koji se u
+    međuvremenu promijenio javlja grešku, umjesto da pod starim content_hashom vrati novi sadržaj.
+    """
+    def metapodaci(filename):
+        putanja = os.path.join(direktorij, filename)
+        stat = os.stat(putanja)
+        return {
+            "rev": _rev_datoteke(stat),
+            "content_hash": _hash_datoteke(putanja, stat.st_mtime_ns, stat.st_size),
+            "izmijenjeno": datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+        }
+
+    def preuzmi(filename, rev=None):
+        with faza("preuzimanje") as f, open(os.path.join(direktorij, filename), "rb") as datoteka:
+            stat = os.fstat(datoteka.fileno())
+            if rev is not None and _rev_datoteke(stat) != rev:
+                raise RuntimeError(f"{filename} se promijenio nakon provjere (rev {rev}, sada {_rev_datoteke(stat)})")
+            # Stranice datoteke čita OS po potrebi; mapiranje ostaje valjano i nakon zatvaranja datoteke
+            sadrzaj = mmap.mmap(datoteka.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+            f["bajtova"] = stat.st_size
+        return sadrzaj
+
+    return {"naziv": direktorij, "metapodaci": metapodaci, "preuzmi": preuzmi}
+
+
+class LazniDropbox:
+    """Dropbox klijent u memoriji procesa (files_get_metadata, files_download, files_upload) s revizijama.
+
+    Za rad bez mreže (testovi, benchmarki, demo): dropbox_izvor(lambda: lazni) prolazi isti put
+    kao pravi Dropbox, a files_upload objavljuje novu reviziju kao jutarnja skripta.
+    """
+
+    def __init__(self, datoteke=None):
+        self._lock = threading.Lock()
+        self._revizije = {}
+        for filename, content in (datoteke or {}).items():
+            self.files_upload(content, f"/{filename}")
+
+    @classmethod
+    def iz_direktorija(cls, direktorij):
+        """Lažni Dropbox s trenutnim sadržajem svih datoteka iz direktorija kao prvom revizijom"""
+        datoteke = {}
+        for filename in sorted(os.listdir(direktorij)):
+            putanja = os.path.join(direktorij, filename)
+            if os.path.isfile(putanja):
+                with open(putanja, "rb") as f:
+                    datoteke[filename] = f.read()
+        return cls(datoteke)
+
+    def check_and_refresh_access_token(self):
+        pass
+
+    def files_upload(self, f, path, **kwargs):
+        """Nova revizija datoteke (kao WriteMode.overwrite); vraća njezine metapodatke"""
+        with self._lock:
+            revizije = self._revizije.setdefault(path.lower(), [])
+            metadata = SimpleNamespace(
+                name=os.path.basename(path),
+                path_display=path,
+                rev=f"{len(revizije) + 1:09x}",
+                size=len(f),
+                content_hash=dropbox_content_hash(f),
+                server_modified=datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            )
+            revizije.append((metadata, bytes(f)))
+            return metadata
+
+    def _revizija(self, path, rev=None):
+        with self._lock:
+            revizije = self._revizije.get(path.lower())
+            if not revizije:
+                raise FileNotFoundError(f"not_found: {path}")
+            if rev is None:
+                return revizije[-1]
+            for revizija in revizije:
+                if revizija[0].rev == rev:
+                    return revizija
+            raise FileNotFoundError(f"not_found: {path} (rev {rev})")
+
+    def files_get_metadata(self, path):
+        return self._revizija(path)[0]
+
+    def files_download(self, path, rev=None):
+        metadata, content = self._revizija(path, rev)
+        return metadata, SimpleNamespace(content=content)
+
+
+def napravi_izvor(vrsta, podaci, klijent=None):
+    """Izvor zadane vrste (jedna od IZVORI).
+
+    podaci je direktorij lokalnog i lažnog izvora, a klijent funkcija koja vraća Dropbox
+    klijent (poziva se tek kod prvog pristupa Dropboxu).
+    """
+    if vrsta == "dropbox":
+        return dropbox_izvor(klijent)
+    if vrsta == "lokalno":
+        return lokalni_izvor(podaci)
+    if vrsta == "lazni":
+        lazni = LazniDropbox.iz_direktorija(podaci)
+        return dropbox_izvor(lambda: lazni, naziv=f"lažni Dropbox ({podaci})")
+    raise ValueError(f"nepoznat izvor: {vrsta} (moguće: {', '.join(IZVORI)})")
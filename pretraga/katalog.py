@@ -0,0 +1,43 @@
+"""Ujedinjeni katalog: svi dućani u jednoj tablici sa stupcem lanca i zajedničkim indeksima"""
+import numpy as np
+import pandas as pd
+
+from .index import izgradi_barkod_indeks, izgradi_indeks_naziva
+from .ingest import izvjestaj_memorije, spoji_blokove
+from .mjerenje import faza
+from .priblizno import izgradi_rjecnik
+from .shema import izvjestaj_sheme
+
+
+def spoji_kataloge(katalozi):
+    """Spaja kataloge ({dućan: katalog}) u jednu tablicu; lanac je kategorijski stupac"""
+    if not katalozi:
+        raise ValueError("nema nijednog učitanog kataloga")
+
+    with faza("spajanje", ducan="svi") as f:
+        imena = list(katalozi)
+        duljine = [len(k) for k in katalozi.values()]
+        # Kod jednog dućana spoji_blokove vraća isti objekt - plitka kopija čuva izvornik
+        katalog = spoji_blokove(list(katalozi.values())).copy(deep=False)
+        katalog.insert(0, "lanac", pd.Categorical.from_codes(
+            np.repeat(np.arange(len(imena)), duljine), categories=imena
+        ))
+        f["redaka"] = len(katalog)
+    return katalog
+
+
+def pripremi_pretragu(katalozi):
+    """Ujedinjeni katalog s indeksom naziva, rječnikom riječi, barkod indeksom te izvještajima o memoriji i shemi po dućanu"""
+    katalog = spoji_kataloge(katalozi)
+    indeks = izgradi_indeks_naziva(katalog)
+    rjecnik = izgradi_rjecnik(katalog["kljuc_naziva"].cat.categories)
+    # Normalizirani ključevi sada su (sortirani) u indeksu; u katalogu bi bili druga kopija istih tekstova
+    del katalog["kljuc_naziva"]
+    return {
+        "katalog": katalog,
+        "indeks": indeks,
+        "rjecnik": rjecnik,
+        "barkodovi": izgradi_barkod_indeks(katalog),
+        "memorija": izvjestaj_memorije(katalozi),
+        "shema": izvjestaj_sheme(katalozi)
+    }
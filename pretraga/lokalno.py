@@ -0,0 +1,94 @@
+"""Učitavanje kataloga bez Streamlita: iz izvora cjenika ili lokalnog direktorija s CSV cjenicima (npr. data/)"""
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import ucitaj_ili_ingestiraj
+from .config import CACHE_DIR, DUCANI_CONFIG
+from .izvori import lokalni_izvor
+from .katalog import pripremi_pretragu
+
+logger = logging.getLogger(__name__)
+
+
+def ucitaj_katalog_iz_izvora(izvor, ducan_naziv, cache_dir=CACHE_DIR):
+    """Vraća (verzija, kanonska tablica) za CSV dućana iz izvora; verzija je content_hash"""
+    filename = DUCANI_CONFIG[ducan_naziv]["filename"]
+    meta = izvor["metapodaci"](filename)
+    return meta["content_hash"], ucitaj_ili_ingestiraj(
+        ducan_naziv, meta["content_hash"], lambda: izvor["preuzmi"](filename, meta["rev"]), cache_dir
+    )
+
+
+def ucitaj_kataloge_iz_izvora(izvor, ducani=None, cache_dir=CACHE_DIR):
+    """{dućan: (verzija, katalog)} za sve dućane čiji CSV postoji u izvoru"""
+    katalozi = {}
+    for ducan_naziv in ducani or DUCANI_CONFIG:
+        try:
+            katalozi[ducan_naziv] = ucitaj_katalog_iz_izvora(izvor, ducan_naziv, cache_dir)
+        except FileNotFoundError:
+            logger.warning("%s: nema datoteke %s u %s", ducan_naziv,
+                           DUCANI_CONFIG[ducan_naziv]["filename"], izvor["naziv"])
+    return katalozi
+
+
+def ucitaj_pretragu_iz_izvora(izvor, ducani=None, cache_dir=CACHE_DIR, trenutna=None):
+    """Ujedinjeni katalog s indeksima za trenutne revizije dućana u izvoru; RuntimeError ako se nijedan ne učita.
+
+    Uz ključeve iz pripremi_pretragu vraća "verzija" ((dućan, content_hash), ...) učitanih dućana,
+    "metapodaci" {dućan: metapodaci revizije u katalogu} i "greske" {dućan: greška}.
+    Ako se učitani dućani trenutne pretrage nisu promijenili, ponovno se učitavaju samo oni
+    koji u njoj nedostaju; dok se nijedan od njih ne učita, vraća se trenutna pretraga bez
+    ponovne izgradnje (s novim greškama, ako ih ima).
+    """
+    ducani = list(ducani or DUCANI_CONFIG)
+    metapodaci, katalozi, greske = {}, {}, {}
+
+    def paralelno(posao, imena):
+        with ThreadPoolExecutor(max_workers=max(len(imena), 1)) as pool:
+            poslovi = {ime: pool.submit(contextvars.copy_context().run, posao, ime) for ime in imena}
+        for ime, rezultat in poslovi.items():
+            try:
+                yield ime, rezultat.result()
+            except Exception as e:
+                greske[ime] = e
+
+    def ucitaj(ime):
+        meta, filename = metapodaci[ime], DUCANI_CONFIG[ime]["filename"]
+        return ucitaj_ili_ingestiraj(
+            ime, meta["content_hash"], lambda: izvor["preuzmi"](filename, meta["rev"]), cache_dir
+        )
+
+    posao = lambda ime: izvor["metapodaci"](DUCANI_CONFIG[ime]["filename"])
+    metapodaci.update(paralelno(posao, ducani))
+    verzija_izvora = tuple((ime, metapodaci[ime]["content_hash"]) for ime in ducani if ime in metapodaci)
+
+    if trenutna is not None and set(trenutna["verzija"]) <= set(verzija_izvora):
+        ucitani = dict(trenutna["verzija"])
+        katalozi.update(paralelno(ucitaj, [ime for ime, _ in verzija_izvora if ime not in ucitani]))
+        if not katalozi:
+            return trenutna if not greske and not trenutna["greske"] else {**trenutna, "greske": greske}
+
+    katalozi.update(paralelno(ucitaj, [ime for ime in metapodaci if ime not in katalozi]))
+    # Lanci u tablici uvijek su poredani kao u DUCANI_CONFIG, neovisno o tome kad su učitani
+    katalozi = {ime: katalozi[ime] for ime in metapodaci if ime in katalozi}
+    if not katalozi:
+        raise RuntimeError("nijedan cjenik nije učitan (" + "; ".join(f"{ime}: {e}" for ime, e in greske.items()) + ")")
+
+    return {
+        **pripremi_pretragu(katalozi),
+        # Samo učitani dućani: nepotpun i kasniji potpun katalog nikad nemaju istu verziju
+        "verzija": tuple(v for v in verzija_izvora if v[0] in katalozi),
+        "metapodaci": {ime: metapodaci[ime] for ime in katalozi},
+        "greske": greske
+    }
+
+
+def ucitaj_lokalni_katalog(direktorij, ducan_naziv, cache_dir=CACHE_DIR):
+    """Vraća (verzija, kanonska tablica) za CSV dućana iz direktorija"""
+    return ucitaj_katalog_iz_izvora(lokalni_izvor(direktorij), ducan_naziv, cache_dir)
+
+
+def ucitaj_lokalne_kataloge(direktorij, ducani=None, cache_dir=CACHE_DIR):
+    """{dućan: (verzija, katalog)} za sve dućane čiji CSV postoji u direktoriju"""
+    return ucitaj_kataloge_iz_izvora(lokalni_izvor(direktorij), ducani, cache_dir)
@@ -0,0 +1,128 @@
+"""Mjerenje trajanja faza pretrage (preuzimanje, ingest, pretraga, prikaz) po dućanima.
+
+Svaka faza uvijek ide u log kao strukturirani redak (ključ=vrijednost); ako je
+pokrenuto mjerenje pretrage, bilježi se i u njegov zapis za prikaz u debug modu.
+Dretve koje rade za pretragu moraju se pokrenuti s kopijom konteksta
+(contextvars.copy_context().run) da bi faze završile u istom zapisu.
+"""
+import logging
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Redoslijed faza u tablici
+FAZE = [
+    "preuzimanje",
+    "disk_cache",
+    "parsiranje",
+    "shema",
+    "kolone",
+    "normalizacija",
+    "cijene",
+    "spajanje",
+    "indeks",
+    "cache_rezultata",
+    "podudaranje",
+    "priblizno",
+    "rezultati",
+    "sortiranje",
+    "prikaz",
+    "excel",
+    "csv",
+]
+
+_mjerenje = ContextVar("mjerenje", default=None)
+_ducan = ContextVar("ducan", default=None)
+
+
+def vrsna_memorija_mb():
+    """Najveća zauzeta memorija procesa (RSS) od pokretanja, u MB; None gdje nije dostupno"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux vraća kB, macOS bajtove
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _logfmt(vrijednost):
+    tekst = str(vrijednost)
+    return f'"{tekst}"' if " " in tekst or not tekst else tekst
+
+
+@contextmanager
+def za_ducan(ducan_naziv):
+    """Faze unutar bloka pripisuju se zadanom dućanu"""
+    token = _ducan.set(ducan_naziv)
+    try:
+        yield
+    finally:
+        _ducan.reset(token)
+
+
+@contextmanager
+def faza(naziv, ducan=None):
+    """Mjeri trajanje bloka; u vraćeni dict mogu se upisati brojači (npr. f["redaka"] = n)"""
+    brojaci = {}
+    t0 = time.perf_counter()
+    try:
+        yield brojaci
+    finally:
+        zapis = {
+            "faza": naziv,
+            "ducan": ducan or _ducan.get(),
+            "ms": (time.perf_counter() - t0) * 1000,
+            **brojaci
+        }
+        mjerenje = _mjerenje.get()
+        if mjerenje is not None:
+            mjerenje["faze"].append(zapis)
+
+        polja = [f"faza={naziv}", f"ducan={_logfmt(zapis['ducan'] or '-')}", f"ms={zapis['ms']:.1f}"]
+        polja += [f"{kljuc}={_logfmt(v)}" for kljuc, v in brojaci.items()]
+        if mjerenje is not None:
+            polja.append(f"pretraga={mjerenje['id']}")
+        logger.info(" ".join(polja))
+
+
+def zapocni_mjerenje(upit=""):
+    """Novi zapis mjerenja za pretragu u tekućem kontekstu"""
+    mjerenje = {"id": uuid.uuid4().hex[:8], "upit": upit, "pocetak": time.perf_counter(), "faze": []}
+    _mjerenje.set(mjerenje)
+    return mjerenje
+
+
+def zavrsi_mjerenje(mjerenje):
+    """Zatvara mjerenje, zapisuje sažetak u log i vraća ukupno trajanje u ms"""
+    _mjerenje.set(None)
+    ukupno = (time.perf_counter() - mjerenje["pocetak"]) * 1000
+    logger.info(
+        "pretraga=%s ukupno_ms=%.1f broj_faza=%d upit=%s",
+        mjerenje["id"], ukupno, len(mjerenje["faze"]), _logfmt(mjerenje["upit"])
+    )
+    return ukupno
+
+
+def tablica_faza(mjerenje):
+    """Faze mjerenja zbrojene po (faza, dućan), poredane redom izvođenja pretrage"""
+    if not mjerenje["faze"]:
+        return pd.DataFrame(columns=["Faza", "Dućan", "Trajanje (ms)", "Redaka"])
+
+    df = pd.DataFrame(mjerenje["faze"])
+    df["ducan"] = df["ducan"].fillna("svi")
+    df["redaka"] = pd.to_numeric(df["redaka"]) if "redaka" in df else float("nan")
+    df = df.groupby(["faza", "ducan"], sort=False).agg(ms=("ms", "sum"), redaka=("redaka", lambda r: r.sum(min_count=1))).reset_index()
+    df["red"] = df["faza"].map({f: i for i, f in enumerate(FAZE)}).fillna(len(FAZE))
+    df = df.sort_values(["red", "ducan"]).drop(columns="red")
+    df["ms"] = df["ms"].round(1)
+    df["redaka"] = df["redaka"].astype("Int64")
+    return df.rename(columns={
+        "faza": "Faza", "ducan": "Dućan", "ms": "Trajanje (ms)", "redaka": "Redaka"
+    }).reset_index(drop=True)
@@ -0,0 +1,75 @@
+"""Normalizirani ključ pretrage: isto pravilo za nazive (jednom, pri ingestu) i za upite.
+
+Ključ je casefold bez dijakritika (č/ć → c, š → s, ž → z, đ → d), s jednim razmakom
+između riječi, decimalnom točkom umjesto zareza i količinom spojenom s jedinicom
+("1 L", "1l" → "1l"; "1,5 kg" → "1.5kg"). Wildcardi * i ? ostaju netaknuti.
+
+Pojam pretrage može prekinuti broj ili jedinicu wildcardom ili nedovršenom riječju
+("0,*", "1 ?", "10 ko"), pa se ključ pojma gradi s normaliziraj_upit: zarez između
+broja i wildcarda postaje točka, a količina se ne spaja s jedinicom - razmak iza
+broja je pri podudaranju neobavezan (RAZMAK_IZA_BROJA).
+"""
+import re
+import unicodedata
+
+import pandas as pd
+
+# Nazivi se normaliziraju kao jedan spojeni tekst (svaki korak jednom, u C-u), pa se razdvajaju
+_SEPARATOR = "\x00"
+
+# NFKD rastavlja slovo na osnovno slovo i kombinirajući naglasak (č → c + ˇ) koji se briše;
+# đ, ø, ł, æ i œ nemaju kanonsku dekompoziciju pa se zamjenjuju izravno
+_NAGLASCI = re.compile("[\u0300-\u036f]")
+_BEZ_DEKOMPOZICIJE = (("đ", "d"), ("ø", "o"), ("ł", "l"), ("æ", "ae"), ("œ", "oe"))
+
+# Uzorci počinju doslovnim znakom (lookbehind tek nakon njega) - regex tada preskače
+# većinu spojenog teksta umjesto da uzorak pokušava na svakoj poziciji
+_RAZMACI = re.compile(r"[^\S\x00]{2,}|[^\S \x00]")
+_DECIMALNI_ZAREZ = re.compile(r",(?<=\d,)(?=\d)")
+_JEDINICA = re.compile(r" (?<=\d )(?=(?:kg|dag|g|mg|l|dl|cl|ml|kom|m)(?![a-z]))")
+_ZAREZ_PRED_WILDCARDOM = re.compile(r",(?<=\d,)(?=[*?])")
+
+# Razmak u ključu pojma koji u ključu naziva može nedostajati ("1 l" / "1l", "10 ko*" / "10kom")
+RAZMAK_IZA_BROJA = re.compile(r" (?<=\d )(?=[a-z*?])")
+
+
+def _normaliziraj(tekst, jedinice=True):
+    tekst = tekst.casefold()
+    if not tekst.isascii():
+        tekst = _NAGLASCI.sub("", unicodedata.normalize("NFKD", tekst))
+        for slovo, zamjena in _BEZ_DEKOMPOZICIJE:
+            tekst = tekst.replace(slovo, zamjena)
+    tekst = _RAZMACI.sub(" ", tekst)
+    tekst = tekst.replace(" " + _SEPARATOR, _SEPARATOR).replace(_SEPARATOR + " ", _SEPARATOR).strip(" ")
+    tekst = _DECIMALNI_ZAREZ.sub(".", tekst)
+    return _JEDINICA.sub("", tekst) if jedinice else tekst
+
+
+def normaliziraj_nazive(nazivi):
+    """Normalizirani ključevi za listu naziva (ili pojmova), istim redom"""
+    kljucevi = _normaliziraj(_SEPARATOR.join(nazivi)).split(_SEPARATOR)
+    if len(kljucevi) != len(nazivi):
+        # Neki naziv sadrži separator - obrađuju se jedan po jedan
+        return [_normaliziraj(n.replace(_SEPARATOR, " ")) for n in nazivi]
+    return kljucevi
+
+
+def normaliziraj_tekst(tekst):
+    """Normalizirani ključ jednog naziva ili pojma pretrage"""
+    return normaliziraj_nazive([tekst])[0]
+
+
+def normaliziraj_upit(pojam):
+    """Normalizirani ključ pojma pretrage (bez spajanja količine s jedinicom, zarez ispred wildcarda je točka)"""
+    tekst = _normaliziraj(pojam.replace(_SEPARATOR, " "), jedinice=False)
+    return _ZAREZ_PRED_WILDCARDOM.sub(".", tekst)
+
+
+def kljuc_naziva(naziv):
+    """Kategorijski stupac normaliziranih ključeva; svaki različiti naziv normalizira se jednom"""
+    if not isinstance(naziv.dtype, pd.CategoricalDtype):
+        naziv = naziv.fillna("").astype("category")
+    kljucevi = pd.Categorical(normaliziraj_nazive(naziv.cat.categories.astype(str).tolist()))
+    # Više naziva može dati isti ključ - kodovi se preslikavaju preko jedinstvenih ključeva
+    kodovi = kljucevi.codes[naziv.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(kodovi, kljucevi.categories), index=naziv.index)
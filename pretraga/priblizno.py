@@ -0,0 +1,124 @@
+"""Približna pretraga: ispravljanje tipfelera prema rječniku riječi iz normaliziranih naziva.
+
+Riječ pojma koje nema u rječniku zamjenjuje se najbližim riječima rječnika
+(Damerau-Levenshtein: najviše 1 izmjena za riječi do 4 znaka, inače 2), a
+ispravljene varijante pojma traže se običnom pretragom. Kandidati se sužavaju
+vektorski preko histograma znakova (jedna izmjena mijenja histogram za najviše 2),
+pa se udaljenost računa samo za malo riječi i unutar vremenskog budžeta.
+"""
+import itertools
+import re
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+from .config import PRIBLIZNO_BUDZET_MS, PRIBLIZNO_VARIJANTI
+from .mjerenje import faza
+from .normalizacija import normaliziraj_upit
+
+# Riječi koje se ispravljaju: barem 3 slova (crtica smije biti unutar riječi); brojevi i količine ne
+RIJEC = re.compile(r"[a-z][a-z-]+[a-z]")
+BINOVA = 32
+
+
+def histogrami_znakova(rijeci):
+    """Broj znakova po binu (code point mod 32) za svaku riječ, kao matrica riječi × BINOVA"""
+    znakovi = np.frombuffer("".join(rijeci).encode("utf-32-le"), dtype=np.uint32)
+    duljine = np.fromiter(map(len, rijeci), dtype=np.int64, count=len(rijeci))
+    rijec = np.repeat(np.arange(len(rijeci), dtype=np.int64), duljine)
+    broj = np.bincount(rijec * BINOVA + znakovi % BINOVA, minlength=len(rijeci) * BINOVA)
+    return broj.reshape(len(rijeci), BINOVA).astype(np.int8)
+
+
+def izgradi_rjecnik(kljucevi):
+    """Sortirane riječi iz normaliziranih ključeva naziva s učestalošću, duljinom i histogramom znakova"""
+    with faza("indeks", ducan="rjecnik") as f:
+        rijeci, broj = np.unique(RIJEC.findall(" ".join(kljucevi)), return_counts=True)
+        rijeci = rijeci.tolist()
+        f["redaka"] = len(rijeci)
+        return {
+            "rijeci": rijeci,
+            "broj": broj,
+            "duljine": np.fromiter(map(len, rijeci), dtype=np.int16, count=len(rijeci)),
+            "histogrami": histogrami_znakova(rijeci)
+        }
+
+
+def u_rjecniku(rijec, rjecnik):
+    """Je li riječ u (sortiranom) rječniku"""
+    rijeci = rjecnik["rijeci"]
+    i = bisect_left(rijeci, rijec)
+    return i < len(rijeci) and rijeci[i] == rijec
+
+
+def udaljenost(a, b, najvise):
+    """Damerau-Levenshtein udaljenost (zamjena susjednih znakova je jedna izmjena); najvise + 1 kad je veća"""
+    if abs(len(a) - len(b)) > najvise:
+        return najvise + 1
+    predzadnji, prethodni = None, list(range(len(b) + 1))
+    for i, znak in enumerate(a, 1):
+        trenutni = [i] + [0] * len(b)
+        for j, drugi in enumerate(b, 1):
+            trenutni[j] = min(prethodni[j] + 1, trenutni[j - 1] + 1, prethodni[j - 1] + (znak != drugi))
+            if i > 1 and j > 1 and znak == b[j - 2] and a[i - 2] == drugi:
+                trenutni[j] = min(trenutni[j], predzadnji[j - 2] + 1)
+        if min(trenutni) > najvise:
+            return najvise + 1
+        predzadnji, prethodni = prethodni, trenutni
+    return min(prethodni[-1], najvise + 1)
+
+
+def slicne_rijeci(rijec, rjecnik, rok):
+    """Riječi rječnika blizu zadanoj, rangirane po udaljenosti pa učestalosti: [(riječ, udaljenost)]"""
+    najvise = 1 if len(rijec) <= 4 else 2
+    razlika = np.abs(rjecnik["histogrami"] - histogrami_znakova([rijec])[0]).sum(axis=1, dtype=np.int16)
+    kandidati = np.flatnonzero(
+        (razlika <= 2 * najvise) & (np.abs(rjecnik["duljine"] - len(rijec)) <= najvise)
+    )
+    # Najsličniji histogrami provjeravaju se prvi - kad istekne budžet, ostaju najvjerojatniji pogoci
+    kandidati = kandidati[np.argsort(razlika[kandidati], kind="stable")]
+
+    nadjene = []
+    for i in kandidati.tolist():
+        if time.perf_counter() > rok:
+            break
+        d = udaljenost(rijec, rjecnik["rijeci"][i], najvise)
+        if d <= najvise:
+            nadjene.append((d, -int(rjecnik["broj"][i]), rjecnik["rijeci"][i]))
+    nadjene.sort()
+    return [(r, d) for d, _, r in nadjene]
+
+
+def varijante_pojma(pojam, rjecnik, rok):
+    """Normalizirani pojam s ispravljenim nepoznatim riječima (wildcardi ostaju), najbliže varijante prve"""
+    dijelovi = re.split(r"([*? ])", normaliziraj_upit(pojam))
+    ispravci = []
+    for i, dio in enumerate(dijelovi):
+        if RIJEC.fullmatch(dio) and not u_rjecniku(dio, rjecnik):
+            slicne = slicne_rijeci(dio, rjecnik, rok)
+            if slicne:
+                # Samo najbliže riječi - uz ispravak s jednom izmjenom oni s dvije su uglavnom šum
+                ispravci.append((i, [s for s in slicne if s[1] == slicne[0][1]][:PRIBLIZNO_VARIJANTI]))
+    if not ispravci:
+        return []
+
+    varijante = []
+    for kombinacija in itertools.product(*(slicne for _, slicne in ispravci)):
+        nova = list(dijelovi)
+        for (i, _), (rijec, _) in zip(ispravci, kombinacija):
+            nova[i] = rijec
+        varijante.append((sum(d for _, d in kombinacija), "".join(nova)))
+    varijante.sort(key=lambda v: v[0])
+    return [v for _, v in varijante[:PRIBLIZNO_VARIJANTI]]
+
+
+def priblizni_pojmovi(pojmovi, rjecnik, budzet_ms=PRIBLIZNO_BUDZET_MS):
+    """{pojam: [ispravljene varijante]} za pojmove s nepoznatim riječima, svi unutar zajedničkog budžeta"""
+    rok = time.perf_counter() + budzet_ms / 1000
+    varijante = {}
+    for pojam in dict.fromkeys(pojmovi):
+        nadjene = varijante_pojma(pojam, rjecnik, rok)
+        if nadjene:
+            varijante[pojam] = nadjene
+    return varijante
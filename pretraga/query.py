@@ -0,0 +1,190 @@
+"""Pretraga (ujedinjenog) kataloga po wildcard pojmovima i barkodu"""
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from .index import trigram_kandidati
+from .ingest import format_gtin, format_gtin_broja, gtin_broj
+from .mjerenje import faza
+from .normalizacija import RAZMAK_IZA_BROJA, normaliziraj_upit
+from .priblizno import priblizni_pojmovi
+
+# Kanonski stupac → stupac tablice rezultata
+KOLONE_REZULTATA = {
+    "lanac": "Trgovački lanac",
+    "sifra": "Šifra",
+    "barkod": "Barkod",
+    "naziv": "Naziv proizvoda",
+    "CIJENA": "Cijena (€)",
+    "jedinica": "Jedinica mjere",
+    "kategorija": "Kategorija"
+}
+
+# Traženi pojam kod približnih pogodaka: "nutela ≈ nutella"
+OZNAKA_PRIBLIZNO = " ≈ "
+
+REDOSLIJED_KOLONA = [
+    "Traženi pojam",
+    "Naziv proizvoda",
+    "Jedinica mjere",
+    "Cijena (€)",
+    "Trgovački lanac",
+    "Šifra",
+    "Barkod",
+    "Kategorija"
+]
+
+
+def wildcard_to_regex(pattern):
+    """Pretvara wildcard pattern (* i ?) u regex nad normaliziranim ključem naziva"""
+    dijelovi = [
+        re.escape(dio).replace(r'\*', '.*').replace(r'\?', '.')
+        for dio in RAZMAK_IZA_BROJA.split(normaliziraj_upit(pattern))
+    ]
+    return '^' + ' ?'.join(dijelovi)
+
+
+def kandidati_za_pojam(pojam, indeks):
+    """Pozicije u sortiranom nizu ključeva za normalizirani pojam i treba li ih još provjeriti regexom"""
+    nazivi = indeks["nazivi"]
+
+    # Neobavezni razmak iza broja za kandidate vrijedi kao wildcard; dio prije prvog
+    # wildcarda je fiksni početak naziva → raspon u sortiranom nizu
+    pojam = RAZMAK_IZA_BROJA.sub("*", pojam)
+    prefiks = re.split(r'[*?]', pojam, maxsplit=1)[0]
+    lo = bisect_left(nazivi, prefiks)
+    hi = bisect_left(nazivi, prefiks + '\U0010ffff', lo)
+
+    if prefiks == pojam:
+        return np.arange(lo, hi), False
+
+    # Wildcard pojam: trigrami i raspon prefiksa sužavaju kandidate
+    kandidati = trigram_kandidati(pojam, indeks["trigrami"])
+    if kandidati is None:
+        return np.arange(lo, hi), True
+    return kandidati[(kandidati >= lo) & (kandidati < hi)], True
+
+
+def redovi_za_pojmove(pojmovi, indeks):
+    """Za svaki pojam redovi kataloga (u izvornom poretku) čiji naziv mu odgovara.
+
+    Wildcard pojam se regexom provjerava samo nad vlastitim kandidatima (raspon prefiksa
+    i trigrami), pa trošak raste sa zbrojem kandidata, a ne s brojem pojmova puta unija kandidata.
+    """
+    nazivi, redoslijed = indeks["nazivi"], indeks["redoslijed"]
+    pozicije = {}
+
+    for pojam in dict.fromkeys(pojmovi):
+        kandidati, treba_regex = kandidati_za_pojam(normaliziraj_upit(pojam), indeks)
+        if treba_regex:
+            match = re.compile(wildcard_to_regex(pojam)).match
+            kandidati = [poz for poz in kandidati.tolist() if match(nazivi[poz]) is not None]
+        pozicije[pojam] = kandidati
+
+    return {
+        pojam: np.sort(redoslijed[np.asarray(poz, dtype=np.int64)])
+        for pojam, poz in pozicije.items()
+    }
+
+
+def redovi_za_pojam(pojam, indeks):
+    """Redovi kataloga (u izvornom poretku) čiji naziv odgovara wildcard pojmu"""
+    return redovi_za_pojmove([pojam], indeks)[pojam]
+
+
+def projekcija_rezultata(df, redovi, trazeni_pojam):
+    """Odabrani redovi kataloga u shemi tablice rezultata, bez prolaska redak po redak"""
+    rez = df.iloc[redovi][list(KOLONE_REZULTATA)].rename(columns=KOLONE_REZULTATA)
+    rez["Cijena (€)"] = rez["Cijena (€)"].astype("float64").round(2)
+    rez["Barkod"] = format_gtin(rez["Barkod"])
+    rez.insert(0, "Traženi pojam", trazeni_pojam)
+    return rez
+
+
+def pretrazi_pojmove(katalog, indeks, pojmovi, rjecnik=None, priblizno=False):
+    """Pretražuje (ujedinjeni) katalog po pojmovima, vraća listu tablica rezultata (prazna ako nema pogodaka).
+
+    Uz rjecnik se pojmovi bez pogodaka (uz priblizno=True svi pojmovi) traže i s ispravljenim
+    tipfelerima; takvi redovi imaju traženi pojam oblika "nutela ≈ nutella".
+    """
+    rezultati = []
+
+    pojmovi = [p for p in (pojmovi or []) if p.strip()]
+    if pojmovi:
+        with faza("podudaranje") as f:
+            pogoci = redovi_za_pojmove(pojmovi, indeks)
+            f["redaka"] = sum(map(len, pogoci.values()))
+
+        varijante = {}
+        bez_pogodaka = [p for p in pojmovi if priblizno or not len(pogoci[p])]
+        if rjecnik is not None and bez_pogodaka:
+            with faza("priblizno") as f:
+                varijante = priblizni_pojmovi(bez_pogodaka, rjecnik)
+                f["varijanti"] = sum(map(len, varijante.values()))
+            if varijante:
+                with faza("podudaranje") as f:
+                    pogoci_varijanti = redovi_za_pojmove([v for vs in varijante.values() for v in vs], indeks)
+                    pogoci.update(pogoci_varijanti)
+                    f["redaka"] = sum(map(len, pogoci_varijanti.values()))
+
+        with faza("rezultati") as f:
+            # Jedna projekcija za sve pojmove: kod skupne pretrage tisuća pojmova cijena je
+            # jedan iloc, a ne tisuću malih tablica
+            oznake, redovi = [], []
+            for pojam in pojmovi:
+                oznake.append(pojam)
+                redovi.append(pogoci[pojam])
+                for varijanta in varijante.get(pojam, []):
+                    oznake.append(f"{pojam}{OZNAKA_PRIBLIZNO}{varijanta}")
+                    redovi.append(pogoci[varijanta])
+            duljine = [len(r) for r in redovi]
+            if sum(duljine):
+                trazeni = np.repeat(np.array(oznake, dtype=object), duljine)
+                rezultati.append(projekcija_rezultata(katalog, np.concatenate(redovi), trazeni))
+            f["redaka"] = sum(duljine)
+
+    return rezultati
+
+
+def pretrazi_barkod(barkod, katalog, indeks):
+    """Traži barkod u (ujedinjenom) katalogu; vraća listu tablica rezultata.
+
+    Barkod indeks su sortirani GTIN-ovi kataloga, pa je traženje binarno (np.searchsorted),
+    a malu tablicu pogodaka gradi izravno iz stupaca kataloga, bez iloc/rename/format_gtin.
+    """
+    gtin = gtin_broj(barkod)
+    if not gtin:
+        return []
+
+    with faza("podudaranje") as f:
+        lo, hi = np.searchsorted(indeks["gtin"], [gtin, gtin + 1])
+        redovi = np.sort(indeks["redovi"][lo:hi])
+        f["redaka"] = len(redovi)
+    if not len(redovi):
+        return []
+
+    with faza("rezultati") as f:
+        rezultat = pd.DataFrame({
+            "Traženi pojam": f"🔢 {barkod.strip()}",
+            **{novi: katalog[stari].array.take(redovi) for stari, novi in KOLONE_REZULTATA.items()}
+        })
+        rezultat["Cijena (€)"] = np.round(katalog["CIJENA"].to_numpy("float64")[redovi], 2)
+        rezultat["Barkod"] = format_gtin_broja(gtin)
+        f["redaka"] = len(rezultat)
+    return [rezultat]
+
+
+def sredi_rezultate(tablice, po_pojmu=False):
+    """Spaja tablice rezultata, sortira po cijeni i uklanja duplikate (isti proizvod u istom lancu).
+
+    Uz po_pojmu=True duplikati se uklanjaju unutar svakog traženog pojma zasebno.
+    """
+    with faza("sortiranje") as f:
+        df = pd.concat(tablice, ignore_index=True)
+        df = df.sort_values("Cijena (€)", kind="stable")
+        kljuc = ["Traženi pojam", "Trgovački lanac", "Šifra"] if po_pojmu else ["Trgovački lanac", "Šifra"]
+        df = df.drop_duplicates(kljuc).reset_index(drop=True)
+        f["redaka"] = len(df)
+    return df[REDOSLIJED_KOLONA]
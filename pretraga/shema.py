@@ -0,0 +1,95 @@
+"""Shema cjenika: koje stvarne kolone CSV-a odgovaraju kanonskim podacima dućana.
+
+Kolone se razrješavaju jednom po potpisu zaglavlja (konfiguracija dućana + nazivi
+kolona), rezultat je read-only i dijeli se među dretvama, a izvještaj o shemi putuje
+s katalogom (i kroz disk cache) do prikaza u debug modu.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+import pandas as pd
+
+# Bez ovih kolona dućan se ne može pretraživati
+OBAVEZNE_KOLONE = ("naziv", "maloprodajna")
+
+# Kolone "najniža cijena u zadnjih 30 dana" nikad nisu cijena artikla
+NAJNIZA_CIJENA = "najni"
+KOLONE_CIJENA = ("maloprodajna", "akcijska")
+
+
+def pronadji_kolonu(stupci, trazeno, iskljuci=()):
+    """(kolona, način) za traženi naziv kolone; redom: isti naziv, kolona sadrži traženo, traženo sadrži kolonu.
+
+    Velika i mala slova i rubni razmaci se zanemaruju; kolone koje sadrže neki od
+    izraza iz iskljuci se preskaču. (None, None) ako ništa ne odgovara.
+    """
+    if trazeno is None:
+        return None, None
+    trazeno = trazeno.lower().strip()
+    mala = {c.lower().strip(): c for c in stupci if not any(x in c.lower() for x in iskljuci)}
+
+    if trazeno in mala:
+        return mala[trazeno], "isti naziv"
+    for mali, stupac in mala.items():
+        if trazeno in mali:
+            return stupac, "sadrži traženo"
+    for mali, stupac in mala.items():
+        if mali in trazeno and len(mali) > 4:
+            return stupac, "dio traženog"
+    return None, None
+
+
+@lru_cache(maxsize=64)
+def _razrijesi(trazene, stupci):
+    kolone, izvjestaj = {}, []
+    for kljuc, trazeno in trazene:
+        iskljuci = (NAJNIZA_CIJENA,) if kljuc in KOLONE_CIJENA else ()
+        kolona, nacin = pronadji_kolonu(stupci, trazeno, iskljuci)
+        if kolona is None and kljuc == "maloprodajna" and trazeno is None:
+            # Dućani bez stalnog naziva kolone (Kaufland): prva kolona s 'maloprod' u nazivu
+            kandidati = [c for c in stupci if "maloprod" in c.lower() and NAJNIZA_CIJENA not in c.lower()]
+            if kandidati:
+                kolona, nacin = kandidati[0], "prepoznato po 'maloprod'"
+
+        napomena = ""
+        if kljuc in KOLONE_CIJENA:
+            najniza, _ = pronadji_kolonu(stupci, trazeno or "maloprod")
+            if najniza is not None and NAJNIZA_CIJENA in najniza.lower() and najniza != kolona:
+                napomena = f"preskočena '{najniza}' (najniža cijena)"
+
+        kolone[kljuc] = kolona
+        izvjestaj.append({
+            "podatak": kljuc,
+            "trazeno": trazeno,
+            "kolona": kolona,
+            "nacin": nacin or "nedostaje",
+            "napomena": napomena
+        })
+
+    nedostaju = [k for k in OBAVEZNE_KOLONE if kolone.get(k) is None]
+    if nedostaju:
+        raise ValueError(
+            f"nisu pronađene kolone: {', '.join(nedostaju)} (kolone u CSV-u: {', '.join(stupci)})"
+        )
+    return MappingProxyType(kolone), tuple(MappingProxyType(r) for r in izvjestaj)
+
+
+def razrijesi_kolone(stupci, config):
+    """(kolone, izvještaj): kanonski podatak → stvarna kolona (None ako je nema) i zapis kako je nađena.
+
+    Rezultat se pamti po potpisu zaglavlja i ne smije se mijenjati; ValueError ako
+    nedostaje neka od OBAVEZNE_KOLONE.
+    """
+    return _razrijesi(tuple(config["columns"].items()), tuple(stupci))
+
+
+def izvjestaj_sheme(katalozi):
+    """Tablica sheme po dućanu (podatak, tražena i nađena kolona, način) za {dućan: katalog}"""
+    reci = [
+        {"Dućan": ime, **zapis}
+        for ime, katalog in katalozi.items()
+        for zapis in katalog.attrs.get("shema", [])
+    ]
+    return pd.DataFrame(reci, columns=["Dućan", "podatak", "trazeno", "kolona", "nacin", "napomena"]).rename(columns={
+        "podatak": "Podatak", "trazeno": "Traženo", "kolona": "Kolona", "nacin": "Način", "napomena": "Napomena"
+    })
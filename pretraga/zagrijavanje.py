@@ -0,0 +1,130 @@
+"""Pozadinsko zagrijavanje: katalog se gradi izvan zahtjeva i atomski postaje aktivna pretraga.
+
+Dretva se pokreće jednom po procesu, odmah gradi katalog, a zatim po rasporedu
+objave cjenika provjerava revizije. Zahtjevi čitaju samo potpuno izgrađenu
+pretragu; zamjena je jedna dodjela pod lockom, pa nikad ne vide pola izgrađen katalog.
+Katalog se u procesu gradi najviše jednom u isto vrijeme: zahtjev koji stigne prije
+prve objave čeka izgradnju koja je u tijeku umjesto da pokrene svoju.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from .cache_rezultata import isprazni_cache_rezultata
+from .config import (
+    DANI_OBJAVE,
+    OBJAVA_CJENIKA,
+    PROVJERA_IZVAN_PROZORA,
+    PROVJERA_NAKON_GRESKE,
+    PROVJERA_U_PROZORU,
+    PROZOR_OBJAVE_MIN,
+)
+from .mjerenje import zapocni_mjerenje, zavrsi_mjerenje
+
+logger = logging.getLogger(__name__)
+
+_aktivna = {"pretraga": None}
+_lock = threading.Lock()
+# Drži se za cijelo vrijeme izgradnje kataloga (zagrijavanje ili zahtjev prije prve objave)
+_gradnja = threading.Lock()
+_dretva = {"dretva": None}
+_stanje = {"provjera": None, "sljedeca": None, "objavljeno": None, "objava": 0}
+
+
+def aktivna_pretraga():
+    """Zadnja objavljena pretraga (None dok se prvi katalog ne izgradi)"""
+    return _aktivna["pretraga"]
+
+
+def objavi_pretragu(pretraga):
+    """Atomski zamjenjuje aktivnu pretragu; vraća False ako je ista verzija već aktivna i potpuna"""
+    with _lock:
+        stara = _aktivna["pretraga"]
+        if stara is not None and stara["verzija"] == pretraga["verzija"] and not stara["greske"]:
+            return False
+        _aktivna["pretraga"] = pretraga
+        _stanje["objavljeno"] = time.time()
+        _stanje["objava"] += 1
+    if stara is None or stara["verzija"] != pretraga["verzija"]:
+        # Rezultati starih verzija više se ne mogu pogoditi, pa se odmah oslobađaju
+        isprazni_cache_rezultata()
+    return True
+
+
+def dohvati_ili_izgradi(osvjezi):
+    """Aktivna pretraga; dok je nema, čeka izgradnju u tijeku ili, ako ni nakon nje nema pretrage, gradi sam.
+
+    osvjezi() je isti posao kao kod pokreni_zagrijavanje; izgrađena pretraga se objavljuje.
+    """
+    pretraga = aktivna_pretraga()
+    if pretraga is not None:
+        return pretraga
+    with _gradnja:
+        pretraga = aktivna_pretraga()
+        if pretraga is None:
+            pretraga = osvjezi()
+            if pretraga is not None:
+                objavi_pretragu(pretraga)
+        return pretraga
+
+
+def sljedeca_provjera(sada, greske=False):
+    """Sekunde do sljedeće provjere revizija: često u prozoru objave, inače rijetko, ali najkasnije na početku prozora.
+
+    Nakon provjere s greškama (neki dućan nije učitan) sljedeća je najkasnije za PROVJERA_NAKON_GRESKE.
+    """
+    if greske:
+        return min(PROVJERA_NAKON_GRESKE, sljedeca_provjera(sada))
+    for dana in range(8):
+        dan = sada + timedelta(days=dana)
+        if dan.weekday() not in DANI_OBJAVE:
+            continue
+        pocetak = dan.replace(hour=OBJAVA_CJENIKA[0], minute=OBJAVA_CJENIKA[1], second=0, microsecond=0)
+        if sada < pocetak:
+            return min(PROVJERA_IZVAN_PROZORA, (pocetak - sada).total_seconds())
+        if sada < pocetak + timedelta(minutes=PROZOR_OBJAVE_MIN):
+            return PROVJERA_U_PROZORU
+    return PROVJERA_IZVAN_PROZORA
+
+
+def _petlja(osvjezi, sada):
+    while True:
+        mjerenje = zapocni_mjerenje("zagrijavanje")
+        greske = True
+        try:
+            with _gradnja:
+                pretraga = osvjezi()
+                objavljeno = pretraga is not None and objavi_pretragu(pretraga)
+            greske = pretraga is None or bool(pretraga["greske"])
+            if objavljeno:
+                logger.info("zagrijavanje=objavljeno pretraga=%s greske=%d", mjerenje["id"], len(pretraga["greske"]))
+        except Exception:
+            logger.exception("Zagrijavanje nije uspjelo, pokušavam ponovno po rasporedu")
+        finally:
+            zavrsi_mjerenje(mjerenje)
+
+        cekanje = sljedeca_provjera(sada(), greske)
+        with _lock:
+            _stanje["provjera"] = time.time()
+            _stanje["sljedeca"] = _stanje["provjera"] + cekanje
+        time.sleep(cekanje)
+
+
+def pokreni_zagrijavanje(osvjezi, sada):
+    """Pokreće (jednom po procesu) dretvu koja odmah, a zatim po rasporedu objave poziva osvjezi().
+
+    osvjezi() vraća novu pretragu za trenutne revizije (ili None); sada() vraća
+    trenutno vrijeme u vremenskoj zoni objave cjenika.
+    """
+    with _lock:
+        if _dretva["dretva"] is None or not _dretva["dretva"].is_alive():
+            _dretva["dretva"] = threading.Thread(target=_petlja, args=(osvjezi, sada), name="zagrijavanje", daemon=True)
+            _dretva["dretva"].start()
+        return _dretva["dretva"]
+
+
+def stanje_zagrijavanja():
+    """Vrijeme zadnje i sljedeće provjere, zadnje objave (Unix sekunde ili None) i broj objava"""
+    with _lock:
+        return dict(_stanje)